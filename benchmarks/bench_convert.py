@@ -0,0 +1,46 @@
+"""Throughput of devterm_web.convert for every source/target format pair.
+
+Usage: python benchmarks/bench_convert.py [--records N] [--repeat N]
+"""
+
+import argparse
+import time
+
+from devterm_web import convert
+
+
+def sample(records):
+    return {'records': [
+        {'id': i, 'name': f'service-{i}', 'enabled': i % 2 == 0, 'weight': i * 0.5,
+         'tags': ['alpha', 'beta', str(i)], 'owner': {'team': 'platform', 'oncall': f'user{i % 7}'}}
+        for i in range(records)
+    ]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--records', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    doc = sample(args.records)
+    texts = {fmt: convert.dumps(fmt, doc) for fmt in convert.FORMATS}
+    print(f'libyaml: {convert.YamlLoader.__name__.startswith("C")}, tomllib: {convert.tomllib is not None}')
+    print(f'{"source":<6} {"target":<6} {"input MB":>9} {"best s":>8} {"MB/s":>8}')
+    results = []
+    for source in convert.FORMATS:
+        text = texts[source]
+        size = len(text.encode()) / 1e6
+        for target in convert.FORMATS:
+            best = float('inf')
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                convert.convert(text, source, target)
+                best = min(best, time.perf_counter() - started)
+            results.append({'source': source, 'target': target, 'input_mb': size, 'seconds': best})
+            print(f'{source:<6} {target:<6} {size:>9.2f} {best:>8.3f} {size / best:>8.1f}')
+    return results
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,371 @@
+"""Latency and throughput of every /api route across payload sizes and concurrency.
+
+Usage:
+    python benchmarks/bench_endpoints.py [--server] [--sizes 100,10k,1M] [--concurrency 1,8]
+        [--tools hash,case] [--accept-encoding gzip] [--output results.json]
+        [--compare baseline.json --tolerance 0.25 --min-p95-ms 5]
+
+Each (tool, payload size, concurrency) cell reports throughput, p50/p95/p99
+latency and the peak RSS seen while it ran. Results are written as JSON; with
+--compare the run fails (exit 1) when p95 latency or throughput is worse than
+the baseline by more than the tolerance. Cells whose baseline p95 is under
+--min-p95-ms are too fast to time reliably and are not compared.
+
+Admission concurrency gates and rate limits are off unless --admission is
+given: their 503s and 429s depend on the CPU count and scheduling of the
+machine, not on the code being measured.
+"""
+
+import argparse
+import base64
+import http.client
+import http.server
+import json
+import os
+import platform
+import sys
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+
+from devterm_web.admission import DEFAULTS, admission
+from devterm_web.app import BATCH_MAX_ITEMS, app
+from devterm_web.tools import registry
+
+UNITS = {'': 1, 'k': 1000, 'm': 1000 ** 2, 'g': 1000 ** 3}
+BYTES_PER_CELL = 256 * 1000 ** 2
+
+
+def parse_size(text):
+    text = text.strip().lower().rstrip('b')
+    unit = text[-1] if text and text[-1] in UNITS else ''
+    return int(float(text[:len(text) - len(unit)]) * UNITS[unit])
+
+
+def current_rss_kb():
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') // 1024
+    except (OSError, ValueError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    index = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+# Scenarios
+#
+# A scenario turns a payload size into (method, path, body, content type).
+# ``max_size`` caps tools whose input is inherently small (QR capacity,
+# password length) so large sweeps don't just measure error paths.
+
+def _json_body(payload):
+    return json.dumps(payload).encode(), 'application/json'
+
+
+def _json_document(size):
+    item = '{"id": 12345, "name": "devterm", "tags": ["a", "b"]}'
+    count = max(1, size // (len(item) + 2))
+    return '[' + ', '.join([item] * count) + ']'
+
+
+class Scenario:
+    def __init__(self, name, build, method='POST', max_size=None):
+        self.name = name
+        self.build = build
+        self.method = method
+        self.max_size = max_size
+
+
+def _scenarios(upstream):
+    return [
+        Scenario('json/format', lambda n: ('/api/json/format', *_json_body({'data': _json_document(n)}))),
+        Scenario('json/stream', lambda n: ('/api/json/stream', _json_document(n).encode(), 'application/json-seq')),
+        Scenario('base64/encode', lambda n: ('/api/base64/encode', *_json_body({'data': 'a' * n}))),
+        Scenario('base64/decode', lambda n: ('/api/base64/decode', *_json_body({'data': base64.b64encode(b'a' * n).decode()}))),
+        Scenario('base64/encode/stream', lambda n: ('/api/base64/encode/stream', os.urandom(n), 'application/octet-stream')),
+        Scenario('base64/decode/stream', lambda n: ('/api/base64/decode/stream', base64.b64encode(os.urandom(n)), 'text/plain')),
+        Scenario('url/encode', lambda n: ('/api/url/encode', *_json_body({'data': 'a b&' * (n // 4 + 1)}))),
+        Scenario('url/decode', lambda n: ('/api/url/decode', *_json_body({'data': 'a%20b' * (n // 5 + 1)}))),
+        Scenario('hash', lambda n: ('/api/hash', *_json_body({'data': 'a' * n}))),
+        Scenario('hash/stream', lambda n: ('/api/hash?algorithms=md5,sha256,sha512', os.urandom(n), 'application/octet-stream')),
+        Scenario('password', lambda n: ('/api/password', *_json_body({'length': n, 'uppercase': True, 'lowercase': True, 'digits': True})),
+                 max_size=10_000),
+        Scenario('uuid', lambda n: (f'/api/uuid?version=7&count={max(1, n // 37)}&format=text', b'', None), method='GET'),
+        Scenario('qrcode', lambda n: ('/api/qrcode', *_json_body({'data': 'a' * n})), max_size=1000),
+        Scenario('qrcode/svg', lambda n: (f'/api/qrcode?format=svg&data={"a" * n}', b'', None), method='GET', max_size=1000),
+        Scenario('case', lambda n: ('/api/case', *_json_body({'data': 'Hello big World ' * (n // 16 + 1), 'type': 'snake'}))),
+        Scenario('convert', lambda n: ('/api/convert', *_json_body({'data': _json_document(n), 'from': 'json', 'to': 'yaml'}))),
+        Scenario('convert/stream', lambda n: ('/api/convert/stream?from=yaml&to=json',
+                                              ('---\nkey: value\nlist: [1, 2, 3]\n' * (n // 36 + 1)).encode(),
+                                              'application/yaml')),
+        Scenario('http', lambda n: ('/api/http', *_json_body({'url': f'{upstream}/{n}'}))),
+        Scenario('http/stream', lambda n: ('/api/http/stream', *_json_body({'url': f'{upstream}/{n}'}))),
+        Scenario('http/multi', lambda n: ('/api/http/multi', *_json_body({'requests': [{'url': f'{upstream}/{n}'}] * 8}))),
+        Scenario('pipeline', lambda n: ('/api/pipeline', *_json_body({
+            'data': urllib.parse.quote(base64.b64encode(_json_document(n).encode()).decode(), safe=''),
+            'steps': [{'tool': 'url/decode'}, {'tool': 'base64/decode'}, {'tool': 'json/format'}, {'tool': 'hash'}]}))),
+        Scenario('batch', lambda n: ('/api/batch', *_json_body({'items': [{'tool': 'url/encode', 'params': {'data': 'a b'}}] * max(1, n // 50)})),
+                 max_size=BATCH_MAX_ITEMS * 50),
+    ]
+
+
+# Drivers
+
+class TestClientDriver:
+    name = 'test-client'
+
+    def __init__(self, headers=None):
+        self.headers = headers or {}
+        self._local = threading.local()
+
+    def send(self, method, path, body, content_type):
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = app.test_client()
+        headers = {**self.headers, 'Content-Type': content_type} if content_type else self.headers
+        response = client.open(path, method=method, data=body, headers=headers)
+        data = response.get_data()
+        # Streamed responses release their admission slot and metrics only when closed.
+        response.close()
+        return response.status_code, len(data)
+
+    def close(self):
+        pass
+
+
+class ServerDriver:
+    name = 'server'
+
+    def __init__(self, headers=None):
+        import logging
+        from werkzeug.serving import make_server
+        logging.getLogger('werkzeug').setLevel(logging.WARNING)
+        self._server = make_server('127.0.0.1', 0, app, threaded=True)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        self.headers = headers or {}
+        self._local = threading.local()
+
+    def send(self, method, path, body, content_type):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = http.client.HTTPConnection('127.0.0.1', self._server.server_port, timeout=300)
+        headers = {**self.headers, 'Content-Type': content_type} if content_type else self.headers
+        try:
+            conn.request(method, path, body=body or None, headers=headers)
+            response = conn.getresponse()
+            return response.status, len(response.read())
+        except (http.client.HTTPException, OSError):
+            conn.close()
+            self._local.conn = None
+            raise
+
+    def close(self):
+        self._server.shutdown()
+
+
+def start_upstream():
+    """Serve GET /<n> with an n-byte body, for the HTTP client tools."""
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        disable_nagle_algorithm = True
+
+        def do_GET(self):
+            size = int(self.path.strip('/') or 0)
+            self.send_response(200)
+            self.send_header('Content-Length', str(size))
+            self.end_headers()
+            self.wfile.write(b'x' * size)
+
+        def log_message(self, *args):
+            pass
+
+    class Server(http.server.ThreadingHTTPServer):
+        def handle_error(self, request, client_address):
+            # The HTTP tool hangs up once it has read its display limit.
+            pass
+
+    server = Server(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_address[1]}'
+
+
+class RssSampler:
+    """Track the peak resident set size on a background thread."""
+
+    def __init__(self, interval=0.01):
+        self.interval = interval
+        self.peak_kb = current_rss_kb()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak_kb = max(self.peak_kb, current_rss_kb())
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.peak_kb = max(self.peak_kb, current_rss_kb())
+
+
+def run_cell(driver, scenario, size, concurrency, requests):
+    path, body, content_type = scenario.build(size)
+    latencies = []
+    errors = 0
+    response_bytes = 0
+    lock = threading.Lock()
+
+    def one(_):
+        nonlocal errors, response_bytes
+        started = time.perf_counter()
+        try:
+            status, length = driver.send(scenario.method, path, body, content_type)
+            failed = status >= 400
+        except Exception:
+            failed, length = True, 0
+        elapsed = time.perf_counter() - started
+        with lock:
+            latencies.append(elapsed)
+            response_bytes += length
+            errors += failed
+
+    with RssSampler() as rss:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            list(pool.map(one, range(requests)))
+        wall = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'tool': scenario.name,
+        'driver': driver.name,
+        'size': size,
+        'concurrency': concurrency,
+        'requests': requests,
+        'errors': errors,
+        'throughput_rps': round(requests / wall, 2),
+        'request_mbps': round(len(body) * requests / wall / 1e6, 3),
+        'response_mbps': round(response_bytes / wall / 1e6, 3),
+        'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 3),
+        'peak_rss_mb': round(rss.peak_kb / 1024, 1),
+    }
+
+
+def compare(results, baseline, tolerance, min_p95_ms=0):
+    """Return regression messages for cells that got slower than the baseline."""
+    key = lambda r: (r['tool'], r['driver'], r['size'], r['concurrency'])
+    previous = {key(r): r for r in baseline['results']}
+    regressions = []
+    for result in results:
+        base = previous.get(key(result))
+        if base is None:
+            continue
+        if base['p95_ms'] < min_p95_ms:
+            continue
+        label = '{} {} size={} c={}'.format(*key(result))
+        if result['p95_ms'] > base['p95_ms'] * (1 + tolerance):
+            regressions.append(f'{label}: p95 {base["p95_ms"]} ms -> {result["p95_ms"]} ms')
+        if result['throughput_rps'] < base['throughput_rps'] * (1 - tolerance):
+            regressions.append(f'{label}: throughput {base["throughput_rps"]} -> {result["throughput_rps"]} req/s')
+        if result['errors'] > base['errors']:
+            regressions.append(f'{label}: errors {base["errors"]} -> {result["errors"]}')
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--server', action='store_true', help='drive a real local HTTP server instead of the test client')
+    parser.add_argument('--tools', help='comma-separated scenario names (default: all)')
+    parser.add_argument('--sizes', default='100,10k,1M', help='payload sizes, e.g. 100,10k,1M,200M')
+    parser.add_argument('--concurrency', default='1,8', help='concurrency levels, e.g. 1,8,32')
+    parser.add_argument('--requests', type=int, default=50, help='requests per cell (fewer for large payloads)')
+    parser.add_argument('--output', help='write results JSON here')
+    parser.add_argument('--compare', help='baseline JSON to check for regressions')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed relative slowdown (default 0.25)')
+    parser.add_argument('--min-p95-ms', type=float, default=5.0,
+                        help='skip cells whose baseline p95 is below this many ms (default 5)')
+    parser.add_argument('--admission', action='store_true',
+                        help='keep admission concurrency gates and rate limits on (their rejections depend on the host)')
+    parser.add_argument('--cache', action='store_true',
+                        help='keep the result cache on (scenarios repeat one payload, so most requests become hits)')
+    parser.add_argument('--accept-encoding', help='send this Accept-Encoding (e.g. gzip) to measure compressed responses')
+    args = parser.parse_args(argv)
+    if not args.cache:
+        registry.cache = None
+    if not args.admission:
+        admission.configure({'rate': 0, 'tools': {tool: {'concurrency': None} for tool in DEFAULTS['tools']}})
+
+    upstream, upstream_url = start_upstream()
+    scenarios = _scenarios(upstream_url)
+    if args.tools:
+        wanted = set(args.tools.split(','))
+        unknown = wanted - {s.name for s in scenarios}
+        if unknown:
+            parser.error(f'unknown tool: {", ".join(sorted(unknown))}')
+        scenarios = [s for s in scenarios if s.name in wanted]
+    sizes = [parse_size(size) for size in args.sizes.split(',')]
+    levels = [int(level) for level in args.concurrency.split(',')]
+
+    headers = {'Accept-Encoding': args.accept_encoding} if args.accept_encoding else {}
+    driver = ServerDriver(headers) if args.server else TestClientDriver(headers)
+    results = []
+    print(f'{"tool":<15} {"size":>10} {"c":>3} {"req/s":>9} {"p50 ms":>9} {"p95 ms":>9} {"p99 ms":>9} {"RSS MB":>7} {"err":>4}')
+    try:
+        for scenario in scenarios:
+            for size in sizes:
+                if scenario.max_size is not None and size > scenario.max_size:
+                    continue
+                for concurrency in levels:
+                    requests = max(concurrency, min(args.requests, BYTES_PER_CELL // max(size, 1)))
+                    r = run_cell(driver, scenario, size, concurrency, requests)
+                    results.append(r)
+                    print(f'{r["tool"]:<15} {r["size"]:>10} {r["concurrency"]:>3} {r["throughput_rps"]:>9} '
+                          f'{r["p50_ms"]:>9} {r["p95_ms"]:>9} {r["p99_ms"]:>9} {r["peak_rss_mb"]:>7} {r["errors"]:>4}')
+    finally:
+        driver.close()
+        upstream.shutdown()
+
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'driver': driver.name,
+            'accept_encoding': args.accept_encoding,
+            'admission': args.admission,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        },
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.tolerance, args.min_p95_ms)
+        for message in regressions:
+            print(f'REGRESSION {message}', file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
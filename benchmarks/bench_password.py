@@ -0,0 +1,38 @@
+"""Passwords per second: buffered byte sampler vs one secrets.choice call per character.
+
+Usage: python benchmarks/bench_password.py [--count N] [--length N]
+"""
+
+import argparse
+import secrets
+import time
+
+from devterm_web import passwords
+
+
+def per_char(charset, length, count):
+    return [''.join(secrets.choice(charset) for _ in range(length)) for _ in range(count)]
+
+
+def sampled(charset, length, count):
+    policy = passwords.Policy(list(passwords.CLASSES), length)
+    return list(passwords.generate(policy, count))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=20000)
+    parser.add_argument('--length', type=int, default=16)
+    args = parser.parse_args()
+
+    charset = ''.join(passwords.CLASSES.values())
+    print(f'{"method":<16} {"passwords/s":>14} {"chars/s":>14}')
+    for name, fn in (('secrets.choice', per_char), ('byte sampler', sampled)):
+        started = time.perf_counter()
+        fn(charset, args.length, args.count)
+        elapsed = time.perf_counter() - started
+        print(f'{name:<16} {args.count / elapsed:>14,.0f} {args.count * args.length / elapsed:>14,.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,237 @@
+"""DevTerm Web - Admission control for the /api/ routes.
+
+Each request is checked, in order, against the tool's maximum body size
+(413), the client's token bucket (429) and the tool's concurrency gate
+(503). Rejections are immediate JSON errors with a Retry-After header, so
+an overloaded tool sheds load instead of slowing the whole service.
+
+Limits are per tool, keyed by the same labels as /metrics ("json/format",
+"pipelines/<name>", ...), except that raw bodies streamed to /api/hash are
+limited as "hash/stream". Settings not given for a tool fall back to the
+top-level values. ``DEVTERM_ADMISSION`` may name a JSON file that overrides
+DEFAULTS, e.g. ``{"rate": 20, "tools": {"convert": {"concurrency": 2}}}``.
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from flask import g, jsonify, request
+
+from devterm_web.metrics import tool_label
+
+CPU_SLOTS = 4 * (os.cpu_count() or 1)
+
+DEFAULTS = {
+    'max_body': 10 * 1024 * 1024,
+    'concurrency': None,
+    'queue': 32,
+    'queue_timeout': 2.0,
+    'rate': 0,
+    'burst': 50,
+    'client_header': None,
+    'tools': {
+        # Streaming routes read their bodies in bounded memory.
+        'json/stream': {'max_body': None},
+        'convert/stream': {'max_body': None},
+        'hash/stream': {'max_body': None},
+        'base64/encode/stream': {'max_body': None},
+        'base64/decode/stream': {'max_body': None},
+        # Parsed once and then queried; each upload may take gigabytes while it is parsed.
+        'documents': {'max_body': 512 * 1024 * 1024, 'concurrency': 2},
+        # CPU-heavy tools that hold the whole document in memory.
+        'json/format': {'concurrency': CPU_SLOTS},
+        'convert': {'concurrency': CPU_SLOTS},
+        'qrcode': {'max_body': 64 * 1024, 'concurrency': CPU_SLOTS},
+        'pipeline': {'concurrency': CPU_SLOTS},
+        'pipelines/<name>': {'concurrency': CPU_SLOTS},
+        'batch': {'concurrency': max(2, CPU_SLOTS // 4)},
+    },
+}
+
+TOOL_SETTINGS = ('max_body', 'concurrency', 'queue', 'queue_timeout')
+# Routes that buffer JSON bodies but stream raw ones; the raw mode is limited as "<tool>/stream".
+RAW_STREAM_MODES = ('hash',)
+MAX_CLIENTS = 10000
+
+
+class TokenBucket:
+    """Per-client token buckets refilled at ``rate`` per second up to ``burst``.
+
+    Buckets are kept for the most recently seen MAX_CLIENTS clients; an
+    evicted client simply starts again with a full bucket.
+    """
+
+    def __init__(self, rate, burst, max_clients=MAX_CLIENTS):
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.max_clients = max_clients
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, client):
+        """Spend one token; return 0 if admitted, else the seconds until a token is available."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(client, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated) * self.rate)
+            admitted = tokens >= 1
+            if admitted:
+                tokens -= 1
+            self._buckets[client] = (tokens, now)
+            if len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+        return 0 if admitted else (1 - tokens) / self.rate
+
+
+class Gate:
+    """Counting semaphore with a bounded wait queue and a wait timeout."""
+
+    def __init__(self, limit, queue, timeout):
+        self.limit = limit
+        self.queue = queue
+        self.timeout = timeout
+        self.active = 0
+        self.waiting = 0
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        with self._cond:
+            if self.active < self.limit:
+                self.active += 1
+                return True
+            if self.waiting >= self.queue:
+                return False
+            self.waiting += 1
+            try:
+                deadline = time.monotonic() + self.timeout
+                while self.active >= self.limit:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return False
+                    self._cond.wait(remaining)
+                self.active += 1
+                return True
+            finally:
+                self.waiting -= 1
+
+    def release(self):
+        with self._cond:
+            self.active -= 1
+            self._cond.notify()
+
+
+def merge(base, overrides):
+    merged = {**base, **{k: v for k, v in overrides.items() if k != 'tools'}}
+    tools = {name: dict(settings) for name, settings in base.get('tools', {}).items()}
+    for name, settings in overrides.get('tools', {}).items():
+        tools.setdefault(name, {}).update(settings)
+    merged['tools'] = tools
+    return merged
+
+
+class Admission:
+    """Body-size, rate and concurrency limits applied before each API request."""
+
+    def __init__(self, config=None):
+        self.configure(config)
+
+    def configure(self, config=None):
+        """Apply ``config`` on top of DEFAULTS, resetting rate buckets and gates."""
+        self.config = merge(DEFAULTS, config or {})
+        rate = self.config['rate']
+        self.buckets = TokenBucket(rate, self.config['burst']) if rate else None
+        self._gates = {}
+        self._lock = threading.Lock()
+
+    def limits(self, tool):
+        settings = self.config['tools'].get(tool, {})
+        return {key: settings.get(key, self.config[key]) for key in TOOL_SETTINGS}
+
+    def gate(self, tool):
+        gate = self._gates.get(tool)
+        if gate is None:
+            limits = self.limits(tool)
+            if not limits['concurrency']:
+                return None
+            with self._lock:
+                gate = self._gates.setdefault(tool, Gate(limits['concurrency'], limits['queue'], limits['queue_timeout']))
+        return gate
+
+    def label(self):
+        tool = tool_label()
+        if tool in RAW_STREAM_MODES and not request.is_json:
+            return f'{tool}/stream'
+        return tool
+
+    def client(self):
+        header = self.config['client_header']
+        if header and request.headers.get(header):
+            # Earlier entries are client-supplied; the last one was added by our own proxy.
+            return request.headers[header].split(',')[-1].strip()
+        return request.remote_addr
+
+    def init_app(self, app):
+        app.before_request(self._before)
+        app.after_request(self._after)
+        app.teardown_request(self._teardown)
+
+    def _reject(self, status, message, retry_after):
+        response = jsonify({'success': False, 'error': message})
+        response.status_code = status
+        if retry_after is not None:
+            response.headers['Retry-After'] = str(max(1, math.ceil(retry_after)))
+        return response
+
+    def _before(self):
+        if not request.path.startswith('/api/'):
+            return None
+        tool = self.label()
+        limits = self.limits(tool)
+        max_body = limits['max_body']
+        if max_body is not None:
+            if (request.content_length or 0) > max_body:
+                return self._reject(413, f'Request body is limited to {max_body} bytes for {tool}', None)
+            try:
+                # Flask 3.1+ also enforces this while reading chunked bodies.
+                request.max_content_length = max_body
+            except AttributeError:
+                pass
+        if self.buckets is not None:
+            wait = self.buckets.take(self.client())
+            if wait:
+                return self._reject(429, 'Rate limit exceeded', wait)
+        gate = self.gate(tool)
+        if gate is not None:
+            if not gate.acquire():
+                return self._reject(503, f'{tool} is at capacity, try again shortly', 1)
+            g.admission_gate = gate
+        return None
+
+    def _after(self, response):
+        # Streamed bodies are still being produced after the view returns,
+        # so they hold their slot until the response is closed.
+        if response.is_streamed:
+            gate = g.pop('admission_gate', None)
+            if gate is not None:
+                response.call_on_close(gate.release)
+        return response
+
+    def _teardown(self, exc):
+        gate = g.pop('admission_gate', None)
+        if gate is not None:
+            gate.release()
+
+
+def load_config(environ=os.environ):
+    path = environ.get('DEVTERM_ADMISSION')
+    if not path:
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+admission = Admission(load_config())
@@ -1,22 +1,28 @@
 """DevTerm Web - Flask web application."""
 
-from flask import Flask, render_template_string, request, jsonify
-import json
-import base64
-import urllib.parse
-import html
-import hashlib
-import uuid
-import re
-import socket
-import time
+from flask import Flask, Response, abort, render_template_string, request, jsonify, stream_with_context
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import hmac
 import io
-import qrcode
-import yaml
-import xmltodict
-import requests
+import json
+import math
+import os
+
+from devterm_web import assets, resultcache
+from devterm_web.admission import admission
+from devterm_web.metrics import metrics
+from devterm_web.tools import registry
+from devterm_web.wire import wire
 
 app = Flask(__name__)
+metrics.init_app(app)
+admission.init_app(app)
+wire.init_app(app)
+
+# Comma-separated tools (or "all") to load at startup instead of on first use.
+registry.warm_up(os.environ.get('DEVTERM_WARMUP', ''))
+registry.cache = resultcache.from_env()
 
 HTML_TEMPLATE = '''
 <!DOCTYPE html>
@@ -25,36 +31,7 @@ HTML_TEMPLATE = '''
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>DevTerm Web - Developer Tools</title>
-    <style>
-        * { box-sizing: border-box; margin: 0; padding: 0; }
-        body { font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; background: #0d1117; color: #e6edf3; min-height: 100vh; }
-        .container { max-width: 1200px; margin: 0 auto; padding: 20px; }
-        h1 { color: #58a6ff; margin-bottom: 30px; font-size: 2rem; }
-        .tools-grid { display: grid; grid-template-columns: repeat(auto-fill, minmax(280px, 1fr)); gap: 16px; margin-bottom: 40px; }
-        .tool-card { background: #161b22; border: 1px solid #30363d; border-radius: 6px; padding: 20px; cursor: pointer; transition: all 0.2s; }
-        .tool-card:hover { border-color: #58a6ff; transform: translateY(-2px); }
-        .tool-card h3 { color: #58a6ff; margin-bottom: 8px; }
-        .tool-card p { color: #8b949e; font-size: 0.9rem; }
-        .tool-section { display: none; margin-top: 30px; }
-        .tool-section.active { display: block; }
-        .tool-header { display: flex; justify-content: space-between; align-items: center; margin-bottom: 20px; }
-        .tool-header h2 { color: #58a6ff; }
-        .back-btn { background: #21262d; color: #e6edf3; border: 1px solid #30363d; padding: 8px 16px; border-radius: 6px; cursor: pointer; }
-        .back-btn:hover { background: #30363d; }
-        textarea, input, select { width: 100%; background: #0d1117; border: 1px solid #30363d; color: #e6edf3; padding: 12px; border-radius: 6px; font-family: monospace; font-size: 14px; margin-bottom: 16px; }
-        textarea:focus, input:focus, select:focus { outline: none; border-color: #58a6ff; }
-        textarea { min-height: 150px; resize: vertical; }
-        .btn { background: #238636; color: white; border: none; padding: 12px 24px; border-radius: 6px; cursor: pointer; font-size: 14px; font-weight: 600; }
-        .btn:hover { background: #2ea043; }
-        .btn-secondary { background: #21262d; }
-        .btn-secondary:hover { background: #30363d; }
-        .output { background: #161b22; border: 1px solid #30363d; padding: 16px; border-radius: 6px; min-height: 100px; white-space: pre-wrap; font-family: monospace; overflow-x: auto; }
-        .error { color: #f85149; }
-        .success { color: #7ee787; }
-        .row { display: flex; gap: 16px; }
-        .col { flex: 1; }
-        label { display: block; margin-bottom: 8px; color: #8b949e; }
-    </style>
+    <link rel="stylesheet" href="{{ asset_url('devterm.css') }}">
 </head>
 <body>
     <div class="container">
@@ -66,6 +43,10 @@ HTML_TEMPLATE = '''
                 <h3>📄 JSON Formatter</h3>
                 <p>Format, validate, minify JSON</p>
             </div>
+            <div class="tool-card" onclick="showTool('convert')">
+                <h3>🔄 Format Converter</h3>
+                <p>JSON, YAML, XML, TOML</p>
+            </div>
             <div class="tool-card" onclick="showTool('base64')">
                 <h3>🔐 Base64</h3>
                 <p>Encode/decode Base64</p>
@@ -118,6 +99,37 @@ HTML_TEMPLATE = '''
             <div id="json-output" class="output" style="margin-top: 16px;"></div>
         </div>
 
+        <!-- Format Converter -->
+        <div id="convert" class="tool-section">
+            <div class="tool-header">
+                <h2>Format Converter</h2>
+                <button class="back-btn" onclick="showTool('')">← Back</button>
+            </div>
+            <textarea id="convert-input" placeholder="Paste your document here..."></textarea>
+            <div class="row">
+                <div class="col">
+                    <label>From</label>
+                    <select id="convert-from">
+                        <option value="json">JSON</option>
+                        <option value="yaml">YAML</option>
+                        <option value="xml">XML</option>
+                        <option value="toml">TOML</option>
+                    </select>
+                </div>
+                <div class="col">
+                    <label>To</label>
+                    <select id="convert-to">
+                        <option value="yaml">YAML</option>
+                        <option value="json">JSON</option>
+                        <option value="xml">XML</option>
+                        <option value="toml">TOML</option>
+                    </select>
+                </div>
+            </div>
+            <button class="btn" onclick="convertFormat()">Convert</button>
+            <div id="convert-output" class="output" style="margin-top: 16px;"></div>
+        </div>
+
         <!-- Base64 -->
         <div id="base64" class="tool-section">
             <div class="tool-header">
@@ -129,6 +141,12 @@ HTML_TEMPLATE = '''
                 <button class="btn" onclick="base64Encode()">Encode</button>
                 <button class="btn btn-secondary" onclick="base64Decode()">Decode</button>
             </div>
+            <label style="margin-top: 16px;">Or a file of any size:</label>
+            <input type="file" id="base64-file">
+            <div>
+                <button class="btn" onclick="base64File('encode')">Encode File</button>
+                <button class="btn btn-secondary" onclick="base64File('decode')">Decode File</button>
+            </div>
             <div id="base64-output" class="output" style="margin-top: 16px;"></div>
         </div>
 
@@ -241,258 +259,502 @@ HTML_TEMPLATE = '''
         </div>
     </div>
 
-    <script>
-        function showTool(tool) {
-            document.querySelectorAll('.tool-section').forEach(el => el.classList.remove('active'));
-            document.getElementById('tools-grid').style.display = tool ? 'none' : 'grid';
-            if (tool) document.getElementById(tool).classList.add('active');
-        }
-
-        async function formatJson() {
-            const input = document.getElementById('json-input').value;
-            const response = await fetch('/api/json/format', {
-                method: 'POST',
-                headers: {'Content-Type': 'application/json'},
-                body: JSON.stringify({data: input, mode: 'format'})
-            });
-            const result = await response.json();
-            document.getElementById('json-output').textContent = result.output || result.error;
-            document.getElementById('json-output').className = 'output ' + (result.success ? 'success' : 'error');
-        }
-
-        async function minifyJson() {
-            const input = document.getElementById('json-input').value;
-            const response = await fetch('/api/json/format', {
-                method: 'POST',
-                headers: {'Content-Type': 'application/json'},
-                body: JSON.stringify({data: input, mode: 'minify'})
-            });
-            const result = await response.json();
-            document.getElementById('json-output').textContent = result.output || result.error;
-            document.getElementById('json-output').className = 'output ' + (result.success ? 'success' : 'error');
-        }
-
-        async function base64Encode() {
-            const input = document.getElementById('base64-input').value;
-            const response = await fetch('/api/base64/encode', {method: 'POST', headers: {'Content-Type': 'application/json'}, body: JSON.stringify({data: input})});
-            const result = await response.json();
-            document.getElementById('base64-output').textContent = result.output || result.error;
-        }
-
-        async function base64Decode() {
-            const input = document.getElementById('base64-input').value;
-            const response = await fetch('/api/base64/decode', {method: 'POST', headers: {'Content-Type': 'application/json'}, body: JSON.stringify({data: input})});
-            const result = await response.json();
-            document.getElementById('base64-output').textContent = result.output || result.error;
-        }
-
-        async function urlEncode() {
-            const input = document.getElementById('url-input').value;
-            const response = await fetch('/api/url/encode', {method: 'POST', headers: {'Content-Type': 'application/json'}, body: JSON.stringify({data: input})});
-            const result = await response.json();
-            document.getElementById('url-output').textContent = result.output || result.error;
-        }
-
-        async function urlDecode() {
-            const input = document.getElementById('url-input').value;
-            const response = await fetch('/api/url/decode', {method: 'POST', headers: {'Content-Type': 'application/json'}, body: JSON.stringify({data: input})});
-            const result = await response.json();
-            document.getElementById('url-output').textContent = result.output || result.error;
-        }
-
-        async function generateHash() {
-            const input = document.getElementById('hash-input').value;
-            const response = await fetch('/api/hash', {method: 'POST', headers: {'Content-Type': 'application/json'}, body: JSON.stringify({data: input})});
-            const result = await response.json();
-            document.getElementById('hash-output').textContent = result.output || result.error;
-        }
-
-        function generateUuid() {
-            document.getElementById('uuid-output').textContent = crypto.randomUUID();
-            document.getElementById('uuid-output').className = 'output success';
-        }
-
-        async function generatePassword() {
-            const length = document.getElementById('pw-length').value;
-            const upper = document.getElementById('pw-upper').checked;
-            const lower = document.getElementById('pw-lower').checked;
-            const digits = document.getElementById('pw-digits').checked;
-            const special = document.getElementById('pw-special').checked;
-            
-            const response = await fetch('/api/password', {
-                method: 'POST',
-                headers: {'Content-Type': 'application/json'},
-                body: JSON.stringify({length, uppercase: upper, lowercase: lower, digits: digits, special: special})
-            });
-            const result = await response.json();
-            document.getElementById('password-output').textContent = result.output || result.error;
-        }
-
-        async function generateQr() {
-            const input = document.getElementById('qr-input').value;
-            const response = await fetch('/api/qrcode', {method: 'POST', headers: {'Content-Type': 'application/json'}, body: JSON.stringify({data: input})});
-            const result = await response.json();
-            if (result.success) {
-                document.getElementById('qr-output').innerHTML = '<img src="' + result.image + '" alt="QR Code">';
-            } else {
-                document.getElementById('qr-output').textContent = result.error;
-            }
-        }
-
-        async function makeRequest() {
-            const url = document.getElementById('http-url').value;
-            const method = document.getElementById('http-method').value;
-            const body = document.getElementById('http-body').value;
-            
-            const response = await fetch('/api/http', {
-                method: 'POST',
-                headers: {'Content-Type': 'application/json'},
-                body: JSON.stringify({url, method, body})
-            });
-            const result = await response.json();
-            document.getElementById('http-output').textContent = result.output || result.error;
-        }
-
-        async function convertCase() {
-            const input = document.getElementById('case-input').value;
-            const caseType = document.getElementById('case-type').value;
-            const response = await fetch('/api/case', {method: 'POST', headers: {'Content-Type': 'application/json'}, body: JSON.stringify({data: input, type: caseType})});
-            const result = await response.json();
-            document.getElementById('case-output').textContent = result.output || result.error;
-        }
-
-        function showTimestamp() {
-            const now = new Date();
-            document.getElementById('timestamp-output').innerHTML = 
-                'Unix: ' + Math.floor(now.getTime() / 1000) + '<br>' +
-                'ISO: ' + now.toISOString() + '<br>' +
-                'Local: ' + now.toString();
-        }
-    </script>
+    <script src="{{ asset_url('devterm.js') }}"></script>
 </body>
 </html>
 '''
 
+# The page and its assets never change at runtime: render them once, compress
+# each encoding on first request, then serve the stored variants by
+# Accept-Encoding with strong ETags.
+INDEX_MAX_AGE = 3600
+ASSET_MAX_AGE = 365 * 24 * 3600
+
+STATIC_ASSETS, ASSET_URLS = assets.load_static(['devterm.css', 'devterm.js'])
+with app.app_context():
+    INDEX_PAGE = assets.Asset(render_template_string(HTML_TEMPLATE, asset_url=ASSET_URLS.get).encode(), 'text/html')
+
 @app.route('/')
 def index():
-    return render_template_string(HTML_TEMPLATE)
+    return INDEX_PAGE.response(request, INDEX_MAX_AGE)
+
+@app.route('/assets/<name>')
+def static_asset(name):
+    # Names carry a content fingerprint, so they can be cached forever.
+    asset = STATIC_ASSETS.get(name)
+    if asset is None:
+        abort(404)
+    return asset.response(request, ASSET_MAX_AGE, immutable=True)
+
+# Helpers
+def request_body_stream():
+    """Return the upload stream for a raw body or a multipart "file" field.
+
+    Flask closes uploaded files when the view returns, so multipart uploads
+    get their own handle that streamed responses can keep reading. Werkzeug
+    spools uploads either to a BytesIO (small) or to a temporary file.
+    """
+    if request.mimetype == 'multipart/form-data':
+        upload = request.files.get('file')
+        if upload is None:
+            raise ValueError('Multipart upload needs a "file" field')
+        stream = upload.stream
+        stream.seek(0)
+        if isinstance(stream, io.BytesIO):
+            return io.BytesIO(stream.getvalue())
+        return os.fdopen(os.dup(stream.fileno()), 'rb')
+    return request.stream
+
+def run_tool(name, params):
+    result = registry.run(name, params)
+    if not result.get('success', True):
+        metrics.mark_failed()
+    return jsonify(result)
+
+def admin_authorized():
+    # Admin endpoints are off unless DEVTERM_ADMIN_TOKEN is set.
+    token = os.environ.get('DEVTERM_ADMIN_TOKEN')
+    supplied = request.headers.get('Authorization', '').removeprefix('Bearer ').strip()
+    return bool(token) and hmac.compare_digest(supplied.encode(), token.encode())
+
+def stream_error(e):
+    from devterm_web import jsonstream
+    error = {'success': False, 'error': str(e)}
+    if isinstance(e, jsonstream.JsonStreamError):
+        error.update(offset=e.offset, line=e.line, column=e.column)
+    return error
+
+def streamed_response(chunks, mimetype, headers=None, download=False):
+    """Stream text chunks, reporting early errors with a 400.
+
+    Errors raised before the first chunk is produced get a regular JSON error
+    response; later ones end the stream with a JSON error line because the
+    status has already been sent. A JSON line would silently corrupt a
+    ``download``, so there the error is re-raised instead and the server
+    drops the connection, leaving the client with an incomplete body.
+    """
+    try:
+        first = next(chunks, '')
+    except Exception as e:
+        return jsonify(stream_error(e)), 400
+
+    def generate():
+        yield first
+        try:
+            yield from chunks
+        except Exception as e:
+            metrics.mark_failed()
+            if download:
+                raise
+            yield '\n' + json.dumps(stream_error(e)) + '\n'
+
+    return Response(stream_with_context(generate()), mimetype=mimetype, headers=headers)
 
 # API Routes
+#
+# Tool logic lives in devterm_web.tools and is loaded on first use; modules
+# with heavy dependencies are imported inside the routes that need them.
 @app.route('/api/json/format', methods=['POST'])
 def json_format():
-    data = request.json.get('data', '')
-    mode = request.json.get('mode', 'format')
+    return run_tool('json/format', request.json)
+
+@app.route('/api/json/stream', methods=['POST'])
+def json_stream():
+    # Token-level reformatting of a raw or multipart body.
+    from devterm_web import jsonstream
+    mode = request.args.get('mode', 'format')
     try:
-        parsed = json.loads(data)
-        if mode == 'minify':
-            return jsonify({'success': True, 'output': json.dumps(parsed, separators=(',', ':'))})
-        return jsonify({'success': True, 'output': json.dumps(parsed, indent=2)})
-    except json.JSONDecodeError as e:
-        return jsonify({'success': False, 'error': str(e)})
+        indent = None if mode == 'minify' else jsonstream.check_indent(request.args.get('indent', 2))
+        stream = request_body_stream()
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    return streamed_response(jsonstream.reformat(jsonstream.read_chunks(stream), indent), 'application/json')
+
+@app.route('/api/convert', methods=['POST'])
+def convert_route():
+    return run_tool('convert', request.json)
+
+@app.route('/api/convert/stream', methods=['POST'])
+def convert_stream():
+    # Item-at-a-time conversion: YAML documents, JSON Lines records or XML
+    # elements at item_depth are converted and streamed as they are parsed.
+    from devterm_web import convert
+    try:
+        source = convert.check_format(request.args.get('from', 'yaml'))
+        target = convert.check_format(request.args.get('to', 'json'))
+        item_depth = int(request.args.get('item_depth', 0))
+        stream = request_body_stream()
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    return streamed_response(convert.convert_stream(stream, source, target, item_depth), convert.MIMETYPES[target])
 
 @app.route('/api/base64/encode', methods=['POST'])
 def base64_encode():
-    data = request.json.get('data', '')
-    return jsonify({'success': True, 'output': base64.b64encode(data.encode()).decode()})
+    return run_tool('base64/encode', request.json)
 
 @app.route('/api/base64/decode', methods=['POST'])
 def base64_decode():
-    data = request.json.get('data', '')
+    return run_tool('base64/decode', request.json)
+
+def base64_stream(direction):
+    # Raw or multipart bodies of any size, returned as a download.
+    from devterm_web import b64stream
     try:
-        return jsonify({'success': True, 'output': base64.b64decode(data.encode()).decode()})
-    except Exception as e:
-        return jsonify({'success': False, 'error': str(e)})
+        variant = b64stream.check_variant(request.args.get('variant', 'standard'))
+        stream = request_body_stream()
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    upload = request.files.get('file')
+    name = request.args.get('filename') or (upload.filename if upload else None) or 'data'
+    if direction == 'encode':
+        chunks, mimetype, name = b64stream.encode_stream(stream, variant), 'text/plain', name + '.b64'
+    else:
+        chunks, mimetype, name = b64stream.decode_stream(stream, variant), 'application/octet-stream', name.removesuffix('.b64')
+    disposition = f'attachment; filename="{name.replace(chr(34), "")}"'
+    return streamed_response(chunks, mimetype, headers={'Content-Disposition': disposition}, download=True)
+
+@app.route('/api/base64/encode/stream', methods=['POST'])
+def base64_encode_stream():
+    return base64_stream('encode')
+
+@app.route('/api/base64/decode/stream', methods=['POST'])
+def base64_decode_stream():
+    return base64_stream('decode')
 
 @app.route('/api/url/encode', methods=['POST'])
 def url_encode():
-    data = request.json.get('data', '')
-    return jsonify({'success': True, 'output': urllib.parse.quote(data, safe='')})
+    return run_tool('url/encode', request.json)
 
 @app.route('/api/url/decode', methods=['POST'])
 def url_decode():
-    data = request.json.get('data', '')
-    return jsonify({'success': True, 'output': urllib.parse.unquote(data)})
+    return run_tool('url/decode', request.json)
 
 @app.route('/api/hash', methods=['POST'])
 def hash_data():
-    data = request.json.get('data', '')
-    output = f'MD5: {hashlib.md5(data.encode()).hexdigest()}\n'
-    output += f'SHA-256: {hashlib.sha256(data.encode()).hexdigest()}\n'
-    output += f'SHA-512: {hashlib.sha512(data.encode()).hexdigest()}'
-    return jsonify({'success': True, 'output': output})
+    if request.is_json:
+        return run_tool('hash', request.json)
+    # Streaming mode: the body is hashed chunk by chunk without buffering it.
+    from devterm_web import hashing
+    try:
+        algorithms = hashing.parse_algorithms(request.args.get('algorithms'))
+        stream = request_body_stream()
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    size, digests = hashing.hash_stream(stream, algorithms)
+    return jsonify({'success': True, 'output': hashing.format_digests(digests), 'digests': digests, 'size': size})
 
 @app.route('/api/password', methods=['POST'])
 def password_gen():
-    import secrets
-    length = int(request.json.get('length', 16))
-    chars = ''
-    if request.json.get('uppercase'): chars += 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
-    if request.json.get('lowercase'): chars += 'abcdefghijklmnopqrstuvwxyz'
-    if request.json.get('digits'): chars += '0123456789'
-    if request.json.get('special'): chars += '!@#$%^&*()_+-=[]{}|;:,.<>?'
-    
-    if not chars:
-        return jsonify({'success': False, 'error': 'Select at least one character type'})
-    
-    password = ''.join(secrets.choice(chars) for _ in range(length))
-    return jsonify({'success': True, 'output': password})
+    if not request.json.get('stream'):
+        return run_tool('password', request.json)
+    # Streaming mode: one password per line, generated as the client reads.
+    from devterm_web import passwords
+    try:
+        policy = passwords.Policy.from_params(request.json)
+        count = passwords.parse_count(request.json.get('count', 1))
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+    def generate():
+        batch = []
+        for password in passwords.generate(policy, count):
+            batch.append(password)
+            if len(batch) == 1000:
+                yield '\n'.join(batch) + '\n'
+                batch = []
+        if batch:
+            yield '\n'.join(batch) + '\n'
+
+    response = Response(generate(), mimetype='text/plain')
+    response.headers['X-Entropy-Bits'] = f'{policy.entropy_bits():.2f}'
+    return response
+
+@app.route('/api/uuid', methods=['GET', 'POST'])
+def uuid_gen():
+    if request.is_json:
+        params = request.json
+    else:
+        params = request.args.to_dict()
+        if 'name' in request.args:
+            params['names'] = request.args.getlist('name')
+    fmt = params.get('format', 'json')
+    if fmt == 'json':
+        return run_tool('uuid', params)
+    # text: one UUID per line; ndjson: one JSON string per line.
+    from devterm_web import uuids
+    if fmt not in ('text', 'ndjson'):
+        return jsonify({'success': False, 'error': f'Unsupported format: {fmt}'}), 400
+    try:
+        chunks = uuids.generate(params)
+    except (TypeError, ValueError) as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    if fmt == 'text':
+        return Response(chunks, mimetype='text/plain')
+    body = ('"' + chunk[:-1].replace('\n', '"\n"') + '"\n' for chunk in chunks)
+    return Response(body, mimetype='application/x-ndjson')
 
 @app.route('/api/qrcode', methods=['POST'])
 def qr_code():
-    data = request.json.get('data', '')
-    qr = qrcode.QRCode(version=1, box_size=10, border=4)
-    qr.add_data(data)
-    qr.make(fit=True)
-    img = qr.make_image(fill_color="black", back_color="white")
-    
-    buffer = io.BytesIO()
-    img.save(buffer, format='PNG')
-    img_str = base64.b64encode(buffer.getvalue()).decode()
-    
-    return jsonify({'success': True, 'image': f'data:image/png;base64,{img_str}'})
+    return run_tool('qrcode', request.json)
+
+@app.route('/api/qrcode', methods=['GET'])
+def qr_code_image():
+    # Raw PNG/SVG for <img src>, cached by content hash and revalidated by ETag.
+    from devterm_web import qr
+    data = request.args.get('data', '')
+    try:
+        options = qr.parse_options(request.args)
+        etag, body = qr.render(data, options)
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    response = Response(body, mimetype=qr.MIMETYPES[options['format']])
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = 86400
+    return response.make_conditional(request)
 
 @app.route('/api/http', methods=['POST'])
 def http_request():
-    url = request.json.get('url', '')
-    method = request.json.get('method', 'GET')
-    body = request.json.get('body', '')
-    
+    return run_tool('http', request.json)
+
+@app.route('/api/http/stream', methods=['POST'])
+def http_stream():
+    # Server-sent events: dns, connect, tls, headers, then body chunks as
+    # they arrive and a final done (or error) event with phase timings.
+    # JSON-only like /api/http, so a cross-site page cannot trigger it without a preflight.
+    from devterm_web import httptrace
+    params = request.json
+    url = params.get('url', '')
     try:
-        kwargs = {'method': method, 'url': url, 'timeout': 30}
-        if body and method in ['POST', 'PUT']:
-            kwargs['data'] = body
-        
-        response = requests.request(**kwargs)
-        output = f'Status: {response.status_code}\n\nHeaders:\n'
-        for k, v in response.headers.items():
-            output += f'{k}: {v}\n'
-        output += f'\nBody:\n{response.text[:2000]}'
-        return jsonify({'success': True, 'output': output})
-    except Exception as e:
-        return jsonify({'success': False, 'error': str(e)})
+        httptrace.parse_url(url)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    events = httptrace.trace(url, params.get('method', 'GET'), params.get('body', ''))
+
+    def generate():
+        try:
+            for event, data in events:
+                yield httptrace.sse(event, data)
+        except Exception as e:
+            metrics.mark_failed()
+            yield httptrace.sse('error', {'error': str(e)})
+
+    return Response(stream_with_context(generate()), mimetype='text/event-stream', headers={'Cache-Control': 'no-cache'})
+
+@app.route('/api/http/multi', methods=['POST'])
+def http_request_multi():
+    return run_tool('http/multi', request.json)
 
 @app.route('/api/case', methods=['POST'])
 def case_convert():
-    data = request.json.get('data', '')
-    case_type = request.json.get('type', 'lower')
-    
-    if case_type == 'upper':
-        output = data.upper()
-    elif case_type == 'lower':
-        output = data.lower()
-    elif case_type == 'title':
-        output = data.title()
-    elif case_type == 'camel':
-        words = re.findall(r'[A-Za-z]+', data)
-        output = words[0].lower() + ''.join(w.capitalize() for w in words[1:])
-    elif case_type == 'snake':
-        output = re.sub(r'[\W]+', '_', data).lower().strip('_')
-    elif case_type == 'kebab':
-        output = re.sub(r'[\W]+', '-', data).lower().strip('-')
-    else:
-        output = data
-    
-    return jsonify({'success': True, 'output': output})
+    return run_tool('case', request.json)
+
+# Pipelines
+@app.route('/api/pipeline', methods=['POST'])
+def pipeline_run():
+    return run_tool('pipeline', request.json)
+
+@app.route('/api/pipelines')
+def pipeline_list():
+    from devterm_web import pipeline
+    return jsonify({'success': True, 'pipelines': pipeline.library.describe()})
+
+@app.route('/api/pipelines/<name>', methods=['PUT'])
+def pipeline_define(name):
+    # Definitions are shared by every worker through the DEVTERM_PIPELINES
+    # file, so changing them needs the admin token.
+    from devterm_web import pipeline
+    if not admin_authorized():
+        return jsonify({'success': False, 'error': 'Forbidden'}), 403
+    steps = (request.json or {}).get('steps')
+    try:
+        pipeline.library.define(name, steps)
+    except LookupError as e:
+        return jsonify({'success': False, 'error': str(e)}), 409
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    return jsonify({'success': True, 'name': name, 'steps': steps})
+
+@app.route('/api/pipelines/<name>', methods=['DELETE'])
+def pipeline_delete(name):
+    from devterm_web import pipeline
+    if not admin_authorized():
+        return jsonify({'success': False, 'error': 'Forbidden'}), 403
+    try:
+        removed = pipeline.library.remove(name)
+    except LookupError as e:
+        return jsonify({'success': False, 'error': str(e)}), 409
+    if not removed:
+        return jsonify({'success': False, 'error': f'Unknown pipeline: {name}'}), 404
+    return jsonify({'success': True})
+
+@app.route('/api/pipelines/<name>', methods=['POST'])
+def pipeline_run_named(name):
+    return run_tool('pipeline', {**(request.json or {}), 'pipeline': name})
+
+# Documents
+#
+# Upload once, then query the parsed document by handle; see documents.py.
+@app.route('/api/documents', methods=['POST'])
+def document_upload():
+    from devterm_web import documents, jsonstream
+    # Refuse oversized uploads before buffering them: by Content-Length when the
+    # body is sent as is, and by counting bytes as they are read otherwise.
+    limit = documents.store.max_bytes // documents.MEMORY_FACTOR
+    too_large = 'Document is too large for the document store'
+    if not request.content_encoding and (request.content_length or 0) > limit:
+        return jsonify({'success': False, 'error': too_large}), 413
+    try:
+        chunks, size = [], 0
+        for chunk in jsonstream.read_chunks(request_body_stream()):
+            size += len(chunk)
+            if size > limit:
+                return jsonify({'success': False, 'error': too_large}), 413
+            chunks.append(chunk)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    data = b''.join(chunks)
+    cost = len(data) * documents.MEMORY_FACTOR
+    # Budget is claimed before parsing, so concurrent uploads cannot overrun it.
+    if not documents.store.reserve(cost):
+        return jsonify({'success': False, 'error': 'Document store is busy parsing other uploads'}), 503, {'Retry-After': '1'}
+    fmt = request.args.get('format', 'json')
+    try:
+        root = registry.run_cpu(documents.parse, data, fmt)
+    except Exception as e:
+        return jsonify({'success': False, 'error': f'Could not parse document: {e}'}), 400
+    finally:
+        documents.store.release(cost)
+    document = documents.Document(root, fmt, len(data))
+    handle = documents.store.add(document)
+    return jsonify({'success': True, 'handle': handle, 'expires_in': documents.store.expires_in(handle),
+                    **document.describe()})
+
+def document_or_404(handle):
+    from devterm_web import documents
+    document = documents.store.get(handle)
+    if document is None:
+        return None, (jsonify({'success': False, 'error': f'Unknown or expired document: {handle}'}), 404)
+    return document, None
+
+@app.route('/api/documents/<handle>')
+def document_info(handle):
+    from devterm_web import documents
+    document, error = document_or_404(handle)
+    if error:
+        return error
+    return jsonify({'success': True, 'handle': handle, 'expires_in': documents.store.expires_in(handle),
+                    **document.describe()})
+
+@app.route('/api/documents/<handle>', methods=['DELETE'])
+def document_delete(handle):
+    from devterm_web import documents
+    if not documents.store.remove(handle):
+        return jsonify({'success': False, 'error': f'Unknown or expired document: {handle}'}), 404
+    return jsonify({'success': True})
+
+@app.route('/api/documents/<handle>/<view>')
+def document_view(handle, view):
+    # query: JSONPath matches; extract: one page of a subtree, pretty-printed;
+    # keys: the key-path index, optionally under a path prefix.
+    from devterm_web import documents
+    document, error = document_or_404(handle)
+    if error:
+        return error
+    args = request.args
+    try:
+        offset, limit = documents.page_args(args.get('offset', 0), args.get('limit', 100))
+        # Views walk the parsed tree (keys builds its index on first use), so they run off the event loop.
+        if view == 'query':
+            matches, next_offset = registry.run_cpu(document.query, args.get('path', '$'), offset, limit)
+            result = {'matches': matches, 'offset': offset, 'next_offset': next_offset}
+        elif view == 'extract':
+            result = registry.run_cpu(document.extract, args.get('path', '$'), offset, limit, args.get('indent', 2))
+        elif view == 'keys':
+            result = registry.run_cpu(document.keys, args.get('prefix', '$'), offset, limit)
+        else:
+            return jsonify({'success': False, 'error': f'Unknown view: {view}'}), 404
+    except KeyError as e:
+        return jsonify({'success': False, 'error': f'No match for {e.args[0]}'}), 404
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    return jsonify({'success': True, **result})
+
+# Observability
+@app.route('/metrics')
+def metrics_endpoint():
+    body = metrics.render()
+    if registry.cache is not None:
+        body += registry.cache.render()
+    return Response(body, mimetype='text/plain; version=0.0.4')
+
+@app.route('/admin/profile', methods=['POST'])
+def admin_profile():
+    # Samples all threads for N seconds and returns collapsed stacks, ready
+    # for flamegraph.pl or speedscope.
+    if not admin_authorized():
+        return jsonify({'success': False, 'error': 'Forbidden'}), 403
+    from devterm_web import profiling
+    try:
+        seconds = float(request.args.get('seconds', 10))
+        interval = float(request.args.get('interval', 0.005))
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    if not (math.isfinite(seconds) and math.isfinite(interval)):
+        return jsonify({'success': False, 'error': 'seconds and interval must be finite numbers'}), 400
+    dump = profiling.profile(seconds, interval)
+    if dump is None:
+        return jsonify({'success': False, 'error': 'A profile is already running'}), 409
+    return Response(dump, mimetype='text/plain')
+
+# Batch
+BATCH_MAX_ITEMS = 10000
+BATCH_MAX_WORKERS = 8
+
+def run_batch_item(index, item):
+    tool_name = item.get('tool') if isinstance(item, dict) else None
+    if tool_name not in registry:
+        return {'index': index, 'tool': tool_name, 'success': False, 'error': f'Unknown tool: {tool_name}'}
+    params = item.get('params') or {}
+    try:
+        result = registry.run(tool_name, params)
+    except Exception as e:
+        result = {'success': False, 'error': str(e)}
+    return {'index': index, 'tool': tool_name, **result}
+
+def run_batch(items, workers=BATCH_MAX_WORKERS):
+    """Run batch items on a thread pool, yielding results in input order.
+
+    At most ``2 * workers`` items are in flight, so results are handed back
+    as soon as the head of the queue finishes instead of after the whole
+    batch.
+    """
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for index, item in enumerate(items):
+            pending.append(pool.submit(run_batch_item, index, item))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+@app.route('/api/batch', methods=['POST'])
+def batch():
+    items = request.json.get('items')
+    if not isinstance(items, list):
+        return jsonify({'success': False, 'error': 'items must be a list of {tool, params} objects'}), 400
+    if len(items) > BATCH_MAX_ITEMS:
+        return jsonify({'success': False, 'error': f'Batch is limited to {BATCH_MAX_ITEMS} items'}), 413
+    try:
+        workers = max(1, min(int(request.json.get('workers', BATCH_MAX_WORKERS)), BATCH_MAX_WORKERS))
+    except (TypeError, ValueError):
+        return jsonify({'success': False, 'error': 'workers must be a number'}), 400
+
+    def generate():
+        for result in run_batch(items, workers):
+            yield json.dumps(result) + '\n'
+
+    return Response(generate(), mimetype='application/x-ndjson')
 
 if __name__ == '__main__':
     app.run(debug=True, port=5000)
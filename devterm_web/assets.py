@@ -0,0 +1,86 @@
+"""DevTerm Web - Precompressed, fingerprinted static responses."""
+
+import gzip
+import hashlib
+import os
+import threading
+
+from flask import Response
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+STATIC_DIR = os.path.join(os.path.dirname(__file__), 'static')
+
+MIMETYPES = {
+    '.css': 'text/css',
+    '.js': 'text/javascript',
+    '.html': 'text/html',
+}
+
+
+class Asset:
+    """A static body with a strong ETag; gzip/brotli variants are built on first request.
+
+    Maximum-quality brotli takes tens of milliseconds per asset, so it is
+    paid once per worker by the first client that asks for it rather than by
+    every worker at import.
+    """
+
+    def __init__(self, body, mimetype):
+        self.mimetype = mimetype
+        self.etag = hashlib.sha256(body).hexdigest()[:20]
+        self.body = body
+        self.variants = {}
+        # Best compression first; variants that turn out no smaller fall back to identity.
+        self.encodings = ('br', 'gzip', 'identity') if brotli is not None else ('gzip', 'identity')
+        self._lock = threading.Lock()
+
+    def variant(self, encoding):
+        """Return ``(encoding, body)``, compressing on first use."""
+        if encoding == 'identity':
+            return encoding, self.body
+        body = self.variants.get(encoding)
+        if body is None:
+            with self._lock:
+                body = self.variants.get(encoding)
+                if body is None:
+                    if encoding == 'br':
+                        body = brotli.compress(self.body, quality=11)
+                    else:
+                        body = gzip.compress(self.body, compresslevel=9, mtime=0)
+                    self.variants[encoding] = body
+        if len(body) >= len(self.body):
+            return 'identity', self.body
+        return encoding, body
+
+    def response(self, request, max_age, immutable=False):
+        encoding, body = self.variant(request.accept_encodings.best_match(self.encodings, default='identity'))
+        response = Response(body, mimetype=self.mimetype)
+        if encoding != 'identity':
+            response.content_encoding = encoding
+        response.vary.add('Accept-Encoding')
+        # Each encoding is a different representation, so it gets its own tag.
+        response.set_etag(self.etag if encoding == 'identity' else f'{self.etag}-{encoding}')
+        response.cache_control.public = True
+        response.cache_control.max_age = max_age
+        if immutable:
+            response.cache_control.immutable = True
+        return response.make_conditional(request)
+
+
+def load_static(names):
+    """Read static files and return ``{fingerprinted_name: Asset}`` plus a name map."""
+    assets = {}
+    urls = {}
+    for name in names:
+        with open(os.path.join(STATIC_DIR, name), 'rb') as f:
+            body = f.read()
+        stem, ext = os.path.splitext(name)
+        asset = Asset(body, MIMETYPES.get(ext, 'application/octet-stream'))
+        fingerprinted = f'{stem}.{asset.etag[:12]}{ext}'
+        assets[fingerprinted] = asset
+        urls[name] = f'/assets/{fingerprinted}'
+    return assets, urls
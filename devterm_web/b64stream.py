@@ -0,0 +1,93 @@
+"""DevTerm Web - Binary-safe, chunked Base64 encoding and decoding."""
+
+import binascii
+
+# Encode chunks are multiples of 57 bytes: 3-byte aligned so no padding
+# appears mid-stream, and exactly 76 output characters per MIME line.
+ENCODE_CHUNK = 57 * 1150
+DECODE_CHUNK = 64 * 1024
+MIME_LINE = 76
+
+VARIANTS = ('standard', 'urlsafe', 'mime')
+
+_TO_URLSAFE = bytes.maketrans(b'+/', b'-_')
+_FROM_URLSAFE = bytes.maketrans(b'-_', b'+/')
+_WHITESPACE = b' \t\r\n'
+_ALPHABET = b'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/='
+
+
+def check_variant(variant):
+    if variant not in VARIANTS:
+        raise ValueError(f'Unsupported variant: {variant}')
+    return variant
+
+
+def _read_exact(stream, size):
+    """Read up to ``size`` bytes, looping over short reads from sockets and pipes."""
+    parts = []
+    remaining = size
+    while remaining:
+        chunk = stream.read(remaining)
+        if not chunk:
+            break
+        parts.append(chunk)
+        remaining -= len(chunk)
+    return b''.join(parts)
+
+
+def encode_stream(stream, variant='standard', chunk_size=ENCODE_CHUNK):
+    """Yield the Base64 encoding of a binary stream in constant memory."""
+    check_variant(variant)
+    chunk_size -= chunk_size % 57
+    while True:
+        chunk = _read_exact(stream, chunk_size)
+        if not chunk:
+            return
+        encoded = binascii.b2a_base64(chunk, newline=False)
+        if variant == 'urlsafe':
+            encoded = encoded.translate(_TO_URLSAFE)
+        elif variant == 'mime':
+            encoded = b''.join(encoded[i:i + MIME_LINE] + b'\r\n' for i in range(0, len(encoded), MIME_LINE))
+        yield encoded
+        if len(chunk) < chunk_size:
+            return
+
+
+def decode_stream(stream, variant='standard', chunk_size=DECODE_CHUNK):
+    """Yield the bytes decoded from a Base64 stream in constant memory.
+
+    Whitespace (MIME line breaks included) is ignored, input is decoded in
+    4-character groups, and missing final padding is accepted. Invalid
+    characters or padding raise ValueError with the character offset.
+    """
+    check_variant(variant)
+    pending = b''
+    offset = 0
+    padded = False
+    while True:
+        chunk = stream.read(chunk_size)
+        final = not chunk
+        data = pending + chunk.translate(None, _WHITESPACE)
+        if variant == 'urlsafe':
+            data = data.translate(_FROM_URLSAFE)
+        if final:
+            if len(data) % 4 == 1:
+                raise ValueError(f'Truncated Base64 input at character {offset + len(data) - 1}')
+            data += b'=' * (-len(data) % 4)
+            usable = len(data)
+        else:
+            usable = len(data) - len(data) % 4
+        pending = data[usable:]
+        group = data[:usable]
+        if group:
+            invalid = group.translate(None, _ALPHABET)
+            if invalid:
+                raise ValueError(f'Invalid Base64 character at {offset + group.index(invalid[:1])}')
+            pad = group.find(b'=')
+            if padded or (pad != -1 and (pad < usable - 2 or group[pad:].strip(b'='))):
+                raise ValueError(f'Unexpected padding at character {offset + max(pad, 0)}')
+            padded = pad != -1
+            yield binascii.a2b_base64(group)
+            offset += usable
+        if final:
+            return
@@ -0,0 +1,181 @@
+"""DevTerm Web - Conversion between JSON, YAML, XML and TOML."""
+
+import json
+import queue
+import threading
+
+import toml
+import xmltodict
+import yaml
+
+try:
+    from yaml import CSafeDumper as YamlDumper, CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeDumper as YamlDumper, SafeLoader as YamlLoader
+
+try:
+    import tomllib
+except ImportError:
+    tomllib = None
+
+FORMATS = ('json', 'yaml', 'xml', 'toml')
+
+MIMETYPES = {
+    'json': 'application/x-ndjson',
+    'yaml': 'application/yaml',
+    'xml': 'application/xml',
+    'toml': 'application/toml',
+}
+
+XML_ROOT = 'root'
+ITEM = 'item'
+_DONE = object()
+
+
+def check_format(fmt):
+    fmt = str(fmt).lower()
+    if fmt == 'yml':
+        fmt = 'yaml'
+    if fmt not in FORMATS:
+        raise ValueError(f'Unsupported format: {fmt}')
+    return fmt
+
+
+def loads(fmt, text):
+    if fmt == 'json':
+        return json.loads(text)
+    if fmt == 'yaml':
+        return yaml.load(text, Loader=YamlLoader)
+    if fmt == 'xml':
+        return xmltodict.parse(text)
+    if tomllib is not None:
+        return tomllib.loads(text)
+    return toml.loads(text)
+
+
+def _xml_document(obj):
+    # XML needs exactly one root element; anything else is wrapped.
+    if isinstance(obj, dict) and len(obj) == 1 and not isinstance(next(iter(obj.values())), list):
+        return obj
+    if isinstance(obj, list):
+        return {XML_ROOT: {ITEM: obj}}
+    return {XML_ROOT: obj}
+
+
+def dumps(fmt, obj):
+    if fmt == 'json':
+        return json.dumps(obj, indent=2, ensure_ascii=False, default=str)
+    if fmt == 'yaml':
+        return yaml.dump(obj, Dumper=YamlDumper, sort_keys=False, allow_unicode=True, default_flow_style=False)
+    if fmt == 'xml':
+        return xmltodict.unparse(_xml_document(obj), pretty=True)
+    if not isinstance(obj, dict):
+        raise ValueError('TOML documents must be tables')
+    return toml.dumps(obj)
+
+
+def convert(text, source, target):
+    """Convert a whole document held in memory."""
+    return dumps(check_format(target), loads(check_format(source), text))
+
+
+# Streaming
+#
+# Sources yield (name, object) pairs one document or record at a time and
+# sinks serialize each pair as soon as it arrives, so only one item is held
+# in memory. YAML streams are split on documents, JSON on lines (JSON Lines)
+# and XML on elements at ``item_depth``.
+
+def _yaml_items(stream, item_depth):
+    for document in yaml.load_all(stream, Loader=YamlLoader):
+        yield ITEM, document
+
+
+def _json_items(stream, item_depth):
+    for line in stream:
+        if line.strip():
+            yield ITEM, json.loads(line)
+
+
+def _xml_items(stream, item_depth):
+    if item_depth <= 0:
+        yield from xmltodict.parse(stream).items()
+        return
+    # xmltodict only offers a callback API, so the parser runs on a helper
+    # thread and hands items over through a small bounded queue.
+    items = queue.Queue(maxsize=64)
+    stopped = threading.Event()
+
+    def put(entry):
+        while not stopped.is_set():
+            try:
+                items.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def on_item(path, item):
+        return put((path[-1][0], item))
+
+    def parse():
+        try:
+            xmltodict.parse(stream, item_depth=item_depth, item_callback=on_item)
+        except xmltodict.ParsingInterrupted:
+            pass
+        except Exception as e:
+            put(e)
+        put(_DONE)
+
+    worker = threading.Thread(target=parse, daemon=True)
+    worker.start()
+    try:
+        while True:
+            entry = items.get()
+            if entry is _DONE:
+                return
+            if isinstance(entry, Exception):
+                raise entry
+            yield entry
+    finally:
+        stopped.set()
+        worker.join()
+
+
+def _toml_items(stream, item_depth):
+    yield ITEM, loads('toml', stream.read().decode())
+
+
+SOURCES = {
+    'json': _json_items,
+    'yaml': _yaml_items,
+    'xml': _xml_items,
+    'toml': _toml_items,
+}
+
+
+def _dump_item(fmt, name, obj):
+    if fmt == 'json':
+        return json.dumps(obj, ensure_ascii=False, default=str) + '\n'
+    if fmt == 'yaml':
+        return yaml.dump(obj, Dumper=YamlDumper, sort_keys=False, allow_unicode=True,
+                         default_flow_style=False, explicit_start=True)
+    if fmt == 'xml':
+        return xmltodict.unparse({name: obj}, full_document=False, pretty=True) + '\n'
+    # Each item becomes one entry of an array of tables.
+    if not isinstance(obj, dict):
+        raise ValueError('TOML documents must be tables')
+    return toml.dumps({name: [obj]}) + '\n'
+
+
+def convert_stream(stream, source, target, item_depth=0):
+    """Convert a binary stream item by item, yielding text as it is produced."""
+    source = check_format(source)
+    target = check_format(target)
+    items = SOURCES[source](stream, item_depth)
+    if target == 'xml':
+        yield f'<?xml version="1.0" encoding="utf-8"?>\n<{XML_ROOT}>\n'
+    for name, obj in items:
+        yield _dump_item(target, name, obj)
+    if target == 'xml':
+        yield f'</{XML_ROOT}>\n'
@@ -0,0 +1,301 @@
+"""DevTerm Web - Upload-once document handles.
+
+A document is parsed once and kept under a random handle, so later queries,
+subtree extraction, paging and key-path listings run against the parsed
+structure and return only the requested slice; query matches too large to
+return whole come back as summaries to page through with extract. Handles
+expire after a sliding TTL, and the least recently used documents are
+dropped when the store exceeds its memory budget.
+
+Parsed documents take several times their text size in memory, so each one
+is charged ``MEMORY_FACTOR`` times its upload size against the budget.
+Handles live in the process that parsed them; with several worker
+processes, route clients to the same worker or use the async server.
+
+Configured from the environment: ``DEVTERM_DOCUMENTS_MB`` (budget) and
+``DEVTERM_DOCUMENTS_TTL`` (seconds since last use).
+"""
+
+import contextlib
+import gc
+import itertools
+import json
+import os
+import secrets
+import threading
+import time
+from collections import Counter, OrderedDict
+
+from devterm_web import jsonpath, jsonstream
+
+MEMORY_FACTOR = 6
+DEFAULT_MB = 2048
+DEFAULT_TTL = 1800
+MAX_DOCUMENTS = 64
+MAX_PAGE = 1000
+MAX_QUERY_BYTES = 1024 * 1024
+
+TYPE_NAMES = {dict: 'object', list: 'array', str: 'string', int: 'number', float: 'number', bool: 'boolean',
+              type(None): 'null'}
+
+
+def type_name(value):
+    return TYPE_NAMES.get(type(value), type(value).__name__)
+
+
+def summary(value):
+    info = {'type': type_name(value)}
+    if isinstance(value, (dict, list, str)):
+        info['length'] = len(value)
+    return info
+
+
+def json_size(value, budget):
+    """Return roughly how many bytes ``value`` serializes to, or None if over ``budget``.
+
+    The walk stops as soon as the budget is spent, so sizing a huge subtree
+    costs no more than the budget itself.
+    """
+    used = 0
+    stack = [value]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, dict):
+            used += 2 + 4 * len(value)
+            if used <= budget:
+                used += sum(len(key) for key in value)
+                stack.extend(value.values())
+        elif isinstance(value, list):
+            used += 2 + len(value)
+            stack.extend(value if used <= budget else ())
+        elif isinstance(value, str):
+            used += 2 + len(value)
+        else:
+            used += 8
+        if used > budget:
+            return None
+    return used
+
+
+def build_index(root):
+    """Collapse every node's path, with array indexes as ``[*]``, into counts and types.
+
+    ``$.items[*].name`` seen a million times is one entry, so the index
+    stays the size of the document's shape rather than of its data. Nodes
+    sharing a path are handled together, which keeps type counting and
+    array flattening in C.
+    """
+    index = {}
+    stack = [('$', [root])]
+    while stack:
+        path, values = stack.pop()
+        types = Counter(map(type, values))
+        counts = {}
+        for kind, count in types.items():
+            name = TYPE_NAMES.get(kind) or kind.__name__
+            counts[name] = counts.get(name, 0) + count
+        index[path] = {'count': len(values), 'types': counts}
+        if types[dict]:
+            members = {}
+            for value in values:
+                if type(value) is dict:
+                    for key, child in value.items():
+                        group = members.get(key)
+                        if group is None:
+                            members[key] = [child]
+                        else:
+                            group.append(child)
+            stack.extend((jsonpath.child_path(path, key), group) for key, group in members.items())
+        if types[list]:
+            stack.append((f'{path}[*]', list(itertools.chain.from_iterable(value for value in values if type(value) is list))))
+    return [{'path': path, **index[path]} for path in sorted(index)]
+
+
+def page_args(offset, limit):
+    offset = int(offset)
+    limit = int(limit)
+    if offset < 0 or not 1 <= limit <= MAX_PAGE:
+        raise ValueError(f'offset must be >= 0 and limit between 1 and {MAX_PAGE}')
+    return offset, limit
+
+
+def page(items, total, offset, limit):
+    """Return ``(slice, next_offset)`` for an iterable of ``total`` items."""
+    selected = list(itertools.islice(items, offset, offset + limit))
+    return selected, (offset + limit if offset + limit < total else None)
+
+
+class Document:
+    def __init__(self, root, fmt, size):
+        self.root = root
+        self.format = fmt
+        self.size = size
+        self.cost = size * MEMORY_FACTOR
+        self._index = None
+        self._lock = threading.Lock()
+
+    def describe(self):
+        return {'format': self.format, 'size': self.size, 'root': summary(self.root)}
+
+    def query(self, path, offset=0, limit=100):
+        """Return one page of matches, up to about MAX_QUERY_BYTES of values.
+
+        Once the page's budget is spent, each further match is returned as its
+        summary with ``truncated`` set; extract pages through it instead.
+        """
+        matches = jsonpath.find(self.root, path)
+        selected = list(itertools.islice(matches, offset, offset + limit + 1))
+        more = len(selected) > limit
+        budget = MAX_QUERY_BYTES
+        results = []
+        for p, v in selected[:limit]:
+            size = json_size(v, budget)
+            if size is None:
+                results.append({'path': p, **summary(v), 'truncated': True})
+            else:
+                budget -= size
+                results.append({'path': p, 'value': v})
+        return results, (offset + limit if more else None)
+
+    def extract(self, path, offset=0, limit=100, indent=2):
+        """Pretty-print one page of the children of the node at ``path``."""
+        indent = jsonstream.check_indent(indent)
+        value = jsonpath.resolve(self.root, path)
+        info = summary(value)
+        if isinstance(value, dict):
+            items, next_offset = page(value.items(), len(value), offset, limit)
+            value = dict(items)
+        elif isinstance(value, list):
+            value, next_offset = page(value, len(value), offset, limit)
+        else:
+            next_offset = None
+        return {**info, 'output': json.dumps(value, indent=indent, ensure_ascii=False, default=str),
+                'offset': offset, 'next_offset': next_offset}
+
+    def keys(self, prefix='$', offset=0, limit=100):
+        with self._lock:
+            if self._index is None:
+                with gc_paused():
+                    self._index = build_index(self.root)
+        entries = [entry for entry in self._index if entry['path'].startswith(prefix)]
+        selected, next_offset = page(entries, len(entries), offset, limit)
+        return {'total': len(entries), 'keys': selected, 'offset': offset, 'next_offset': next_offset}
+
+
+class DocumentStore:
+    """Parsed documents by handle, with a sliding TTL and an LRU memory budget."""
+
+    def __init__(self, max_bytes=DEFAULT_MB * 1024 * 1024, ttl=DEFAULT_TTL, max_documents=MAX_DOCUMENTS):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.max_documents = max_documents
+        self._documents = OrderedDict()
+        self._used = 0
+        self._reserved = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._documents)
+
+    def add(self, document):
+        if document.cost > self.max_bytes:
+            raise ValueError(f'Document needs about {document.cost // 2**20} MB; the store holds {self.max_bytes // 2**20} MB')
+        handle = secrets.token_urlsafe(12)
+        with self._lock:
+            self._expire()
+            self._documents[handle] = (document, time.monotonic() + self.ttl)
+            self._used += document.cost
+            while self._used > self.max_bytes or len(self._documents) > self.max_documents:
+                _, (evicted, _) = self._documents.popitem(last=False)
+                self._used -= evicted.cost
+        return handle
+
+    def reserve(self, cost):
+        """Claim budget for a document about to be parsed, evicting stored ones to make room.
+
+        Returns False if uploads already being parsed leave no room; the
+        caller must ``release`` a successful reservation when parsing ends.
+        """
+        with self._lock:
+            if self._reserved + cost > self.max_bytes:
+                return False
+            self._expire()
+            self._reserved += cost
+            while self._documents and self._used + self._reserved > self.max_bytes:
+                _, (evicted, _) = self._documents.popitem(last=False)
+                self._used -= evicted.cost
+            return True
+
+    def release(self, cost):
+        with self._lock:
+            self._reserved -= cost
+
+    def get(self, handle):
+        with self._lock:
+            self._expire()
+            entry = self._documents.get(handle)
+            if entry is None:
+                return None
+            self._documents[handle] = (entry[0], time.monotonic() + self.ttl)
+            self._documents.move_to_end(handle)
+            return entry[0]
+
+    def expires_in(self, handle):
+        with self._lock:
+            entry = self._documents.get(handle)
+            return None if entry is None else round(entry[1] - time.monotonic())
+
+    def remove(self, handle):
+        with self._lock:
+            entry = self._documents.pop(handle, None)
+            if entry is not None:
+                self._used -= entry[0].cost
+            return entry is not None
+
+    def _expire(self):
+        now = time.monotonic()
+        for handle in [h for h, (_, expires) in self._documents.items() if expires <= now]:
+            self._used -= self._documents.pop(handle)[0].cost
+
+
+_gc_lock = threading.Lock()
+_gc_pauses = 0
+_gc_was_enabled = True
+
+
+@contextlib.contextmanager
+def gc_paused():
+    """Hold off cyclic GC while building large object graphs.
+
+    Collections triggered by millions of new containers rescan the growing
+    tree and can triple parse and indexing times. Reference counting still
+    frees garbage meanwhile; overlapping pauses re-enable GC only when the
+    last one ends.
+    """
+    global _gc_pauses, _gc_was_enabled
+    with _gc_lock:
+        if _gc_pauses == 0:
+            _gc_was_enabled = gc.isenabled()
+            gc.disable()
+        _gc_pauses += 1
+    try:
+        yield
+    finally:
+        with _gc_lock:
+            _gc_pauses -= 1
+            if _gc_pauses == 0 and _gc_was_enabled:
+                gc.enable()
+
+
+def parse(data, fmt):
+    """Parse uploaded bytes in any format the converter reads."""
+    from devterm_web import convert
+    fmt = convert.check_format(fmt)
+    with gc_paused():
+        if fmt == 'json':
+            return json.loads(data)
+        return convert.loads(fmt, data.decode())
+
+
+store = DocumentStore(int(float(os.environ.get('DEVTERM_DOCUMENTS_MB', DEFAULT_MB)) * 1024 * 1024),
+                      float(os.environ.get('DEVTERM_DOCUMENTS_TTL', DEFAULT_TTL)))
@@ -0,0 +1,89 @@
+"""DevTerm Web - Single-pass, multi-algorithm hashing."""
+
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+CHUNK_SIZE = 1024 * 1024
+
+LABELS = {
+    'md5': 'MD5',
+    'sha1': 'SHA-1',
+    'sha256': 'SHA-256',
+    'sha512': 'SHA-512',
+    'blake2b': 'BLAKE2b',
+    'blake2s': 'BLAKE2s',
+    'sha3_256': 'SHA3-256',
+    'sha3_512': 'SHA3-512',
+}
+
+DEFAULT_ALGORITHMS = ('md5', 'sha256', 'sha512')
+
+
+def _alias(name):
+    return name.strip().lower().replace('-', '').replace('_', '')
+
+
+# Accept hashlib names, the printed labels and their hyphenated forms ("sha3_256", "SHA3-256", "sha-256").
+ALIASES = {_alias(text): name for name, label in LABELS.items() for text in (name, label)}
+
+# hashlib releases the GIL while hashing buffers larger than 2 KiB, so one
+# thread per digest lets the algorithms run side by side on the same chunk.
+_pool = ThreadPoolExecutor(max_workers=len(LABELS), thread_name_prefix='hash')
+
+# Cleared by the async server: once threads are green, the pool adds
+# switching overhead without any parallelism.
+parallel = True
+
+
+def parse_algorithms(value):
+    """Turn a list or comma-separated string into validated algorithm names."""
+    if not value:
+        return DEFAULT_ALGORITHMS
+    if isinstance(value, str):
+        value = value.split(',')
+    value = [str(name).strip() for name in value if str(name).strip()]
+    unknown = [name for name in value if _alias(name) not in ALIASES]
+    if unknown:
+        raise ValueError(f'Unsupported algorithm: {", ".join(unknown)}')
+    return tuple(dict.fromkeys(ALIASES[_alias(name)] for name in value)) or DEFAULT_ALGORITHMS
+
+
+def _update_all(hashers, chunk):
+    if not parallel or len(hashers) == 1 or len(chunk) < 64 * 1024:
+        for hasher in hashers:
+            hasher.update(chunk)
+        return []
+    return [_pool.submit(hasher.update, chunk) for hasher in hashers]
+
+
+def hash_stream(stream, algorithms=DEFAULT_ALGORITHMS, chunk_size=CHUNK_SIZE):
+    """Hash a file-like object in one pass over fixed-size chunks.
+
+    Reading the next chunk overlaps with hashing the current one, so at most
+    two chunks are held in memory regardless of the input size. Returns
+    ``(size, {algorithm: hexdigest})``.
+    """
+    hashers = [hashlib.new(name) for name in algorithms]
+    size = 0
+    pending = []
+    while True:
+        chunk = stream.read(chunk_size)
+        for future in pending:
+            future.result()
+        if not chunk:
+            break
+        size += len(chunk)
+        pending = _update_all(hashers, chunk)
+    return size, {name: hasher.hexdigest() for name, hasher in zip(algorithms, hashers)}
+
+
+def hash_bytes(data, algorithms=DEFAULT_ALGORITHMS):
+    """Hash an in-memory buffer with every requested algorithm."""
+    hashers = [hashlib.new(name) for name in algorithms]
+    for future in _update_all(hashers, data):
+        future.result()
+    return {name: hasher.hexdigest() for name, hasher in zip(algorithms, hashers)}
+
+
+def format_digests(digests):
+    return '\n'.join(f'{LABELS[name]}: {digest}' for name, digest in digests.items())
@@ -0,0 +1,114 @@
+"""DevTerm Web - Pooled HTTP client for the HTTP Client tool."""
+
+import codecs
+import threading
+import time
+import urllib.parse
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+BODY_LIMIT = 2000
+TIMEOUT = 30
+MAX_HOSTS = 64
+MAX_CONCURRENCY = 32
+DEFAULT_CONCURRENCY = 8
+MAX_REQUESTS = 100
+BODY_METHODS = ('POST', 'PUT', 'PATCH')
+
+
+class SessionPool:
+    """Keep-alive sessions keyed by scheme and host, least recently used first out."""
+
+    def __init__(self, max_hosts=MAX_HOSTS, pool_maxsize=MAX_CONCURRENCY):
+        self.max_hosts = max_hosts
+        self.pool_maxsize = pool_maxsize
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, url):
+        parts = urllib.parse.urlsplit(url)
+        key = (parts.scheme.lower(), parts.netloc.lower())
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is not None:
+                self._sessions.move_to_end(key)
+                return session
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_maxsize)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            self._sessions[key] = session
+            if len(self._sessions) > self.max_hosts:
+                _, evicted = self._sessions.popitem(last=False)
+                evicted.close()
+            return session
+
+    def close(self):
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+
+sessions = SessionPool()
+
+
+def read_text(response, limit=BODY_LIMIT):
+    """Decode at most ``limit`` characters of a streamed body.
+
+    Reading stops as soon as the limit is reached, so large bodies are never
+    downloaded in full. Returns ``(text, truncated)``.
+    """
+    decoder = codecs.getincrementaldecoder(response.encoding or 'utf-8')(errors='replace')
+    parts = []
+    length = 0
+    truncated = False
+    for chunk in response.iter_content(chunk_size=max(limit, 1024)):
+        text = decoder.decode(chunk)
+        parts.append(text)
+        length += len(text)
+        if length >= limit:
+            truncated = True
+            break
+    else:
+        parts.append(decoder.decode(b'', final=True))
+    text = ''.join(parts)
+    return text[:limit], truncated or len(text) > limit
+
+
+def send(url, method='GET', body='', timeout=TIMEOUT, limit=BODY_LIMIT):
+    """Send one request through the pooled session for its host."""
+    method = method.upper()
+    kwargs = {'timeout': timeout, 'stream': True}
+    if body and method in BODY_METHODS:
+        kwargs['data'] = body
+    started = time.perf_counter()
+    try:
+        with sessions.get(url).request(method, url, **kwargs) as response:
+            text, truncated = read_text(response, limit)
+            elapsed_ms = round((time.perf_counter() - started) * 1000, 2)
+            output = f'Status: {response.status_code}\n\nHeaders:\n'
+            for k, v in response.headers.items():
+                output += f'{k}: {v}\n'
+            output += f'\nBody:\n{text}'
+            return {'success': True, 'output': output, 'status': response.status_code,
+                    'elapsed_ms': elapsed_ms, 'truncated': truncated}
+    except Exception as e:
+        return {'success': False, 'error': str(e)}
+
+
+def send_many(specs, concurrency=DEFAULT_CONCURRENCY, limit=BODY_LIMIT):
+    """Send several requests concurrently, returning results in input order."""
+    concurrency = max(1, min(int(concurrency), MAX_CONCURRENCY, len(specs) or 1))
+
+    def run(spec):
+        if not isinstance(spec, dict):
+            return {'success': False, 'error': 'Each request must be an object with a url'}
+        result = send(spec.get('url', ''), spec.get('method', 'GET'), spec.get('body', ''), limit=limit)
+        return {'url': spec.get('url', ''), **result}
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='http') as pool:
+        return list(pool.map(run, specs))
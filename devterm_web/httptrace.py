@@ -0,0 +1,153 @@
+"""DevTerm Web - Traced HTTP requests with per-phase timings.
+
+Unlike httpclient, which reuses pooled keep-alive sessions, a traced
+request opens its own connection so every phase can be timed: DNS
+resolution, TCP connect, TLS handshake, time to first byte (request sent
+until the status line and headers have arrived) and body transfer.
+Redirects are reported rather than followed.
+"""
+
+import codecs
+import http.client
+import json
+import socket
+import ssl
+import time
+import urllib.parse
+
+from devterm_web import __version__
+from devterm_web.httpclient import BODY_LIMIT, BODY_METHODS, TIMEOUT
+
+STREAM_LIMIT = 1024 * 1024
+READ_SIZE = 16 * 1024
+USER_AGENT = f'devterm-web/{__version__}'
+
+
+def parse_url(url):
+    """Return ``(scheme, host, port, host_header, target)`` for an http(s) URL."""
+    parts = urllib.parse.urlsplit(url)
+    if parts.scheme not in ('http', 'https') or not parts.hostname:
+        raise ValueError(f'Unsupported URL: {url}')
+    port = parts.port or (443 if parts.scheme == 'https' else 80)
+    target = parts.path or '/'
+    if parts.query:
+        target += f'?{parts.query}'
+    return parts.scheme, parts.hostname, port, parts.netloc.rpartition('@')[2], target
+
+
+def _ms(started):
+    return round((time.perf_counter() - started) * 1000, 2)
+
+
+def _connect(addresses, timeout):
+    # Same fallback as socket.create_connection, over pre-resolved addresses.
+    error = None
+    for family, kind, proto, _, address in addresses:
+        sock = socket.socket(family, kind, proto)
+        try:
+            sock.settimeout(timeout)
+            sock.connect(address)
+            return sock
+        except OSError as e:
+            error = e
+            sock.close()
+    raise error or OSError('No addresses to connect to')
+
+
+def _decoder(response):
+    try:
+        return codecs.getincrementaldecoder(response.headers.get_content_charset() or 'utf-8')(errors='replace')
+    except LookupError:
+        return codecs.getincrementaldecoder('utf-8')(errors='replace')
+
+
+def trace(url, method='GET', body='', timeout=TIMEOUT, limit=STREAM_LIMIT):
+    """Send one request, yielding ``(event, data)`` pairs as it progresses.
+
+    Events are ``dns``, ``connect``, ``tls`` (HTTPS only) and ``headers``,
+    each with the phase duration in ``ms``; then ``body`` text chunks as
+    they arrive, stopping after ``limit`` bytes; then ``done`` with all
+    timings. Network errors are raised from the generator.
+    """
+    scheme, host, port, host_header, target = parse_url(url)
+    method = method.upper()
+    timings = {}
+    started = phase = time.perf_counter()
+    addresses = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    timings['dns_ms'] = _ms(phase)
+    yield 'dns', {'ms': timings['dns_ms'], 'addresses': sorted({info[4][0] for info in addresses})}
+
+    phase = time.perf_counter()
+    sock = _connect(addresses, timeout)
+    try:
+        timings['connect_ms'] = _ms(phase)
+        yield 'connect', {'ms': timings['connect_ms'], 'address': sock.getpeername()[0]}
+        if scheme == 'https':
+            phase = time.perf_counter()
+            sock = ssl.create_default_context().wrap_socket(sock, server_hostname=host)
+            timings['tls_ms'] = _ms(phase)
+            yield 'tls', {'ms': timings['tls_ms'], 'version': sock.version(), 'cipher': sock.cipher()[0]}
+
+        connection = http.client.HTTPConnection(host, port, timeout=timeout)
+        connection.sock = sock
+        headers = {'Host': host_header, 'User-Agent': USER_AGENT, 'Accept-Encoding': 'identity', 'Connection': 'close'}
+        data = body.encode() if body and method in BODY_METHODS else None
+        phase = time.perf_counter()
+        connection.request(method, target, body=data, headers=headers)
+        response = connection.getresponse()
+        timings['ttfb_ms'] = _ms(phase)
+        yield 'headers', {'ms': timings['ttfb_ms'], 'status': response.status, 'reason': response.reason,
+                          'headers': response.getheaders()}
+
+        phase = time.perf_counter()
+        decoder = _decoder(response)
+        received = 0
+        truncated = False
+        while not truncated:
+            chunk = response.read1(READ_SIZE)
+            if not chunk:
+                break
+            if received + len(chunk) > limit:
+                chunk = chunk[:limit - received]
+                truncated = True
+            received += len(chunk)
+            text = decoder.decode(chunk, final=truncated)
+            if text:
+                yield 'body', {'text': text}
+        text = '' if truncated else decoder.decode(b'', final=True)
+        if text:
+            yield 'body', {'text': text}
+        timings['transfer_ms'] = _ms(phase)
+        timings['total_ms'] = _ms(started)
+        yield 'done', {'timings': timings, 'bytes': received, 'truncated': truncated}
+    finally:
+        sock.close()
+
+
+def sse(event, data):
+    """Format one server-sent event."""
+    return f'event: {event}\ndata: {json.dumps(data)}\n\n'
+
+
+def send(url, method='GET', body='', timeout=TIMEOUT, limit=BODY_LIMIT):
+    """Traced counterpart of httpclient.send: the same result plus ``timings``."""
+    head = done = None
+    parts = []
+    try:
+        # Read at most 4 bytes per displayed character, enough for any UTF-8 text.
+        for event, data in trace(url, method, body, timeout, limit * 4):
+            if event == 'headers':
+                head = data
+            elif event == 'body':
+                parts.append(data['text'])
+            elif event == 'done':
+                done = data
+    except Exception as e:
+        return {'success': False, 'error': str(e)}
+    text = ''.join(parts)
+    output = f'Status: {head["status"]}\n\nHeaders:\n'
+    for k, v in head['headers']:
+        output += f'{k}: {v}\n'
+    output += f'\nBody:\n{text[:limit]}'
+    return {'success': True, 'output': output, 'status': head['status'], 'elapsed_ms': done['timings']['total_ms'],
+            'truncated': done['truncated'] or len(text) > limit, 'timings': done['timings']}
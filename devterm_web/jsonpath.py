@@ -0,0 +1,149 @@
+"""DevTerm Web - JSONPath-style queries over parsed documents.
+
+Supported syntax: ``$`` for the root, ``.name`` and ``['name']`` members,
+``[n]`` indexes (negative counts from the end), ``[start:end:step]``
+slices, ``*`` wildcards, ``..`` recursive descent and unions such as
+``['a','b']`` or ``[0,2]``. Filter expressions are not supported.
+
+Matches are produced lazily as ``(path, value)`` pairs, so a query can be
+paged without walking the whole document.
+"""
+
+import ast
+import json
+import re
+
+_IDENTIFIER = re.compile(r'[A-Za-z_$][\w$-]*')
+_TOKEN = re.compile(r'''
+    (?P<deep>\.\.)
+  | \.(?P<name>[A-Za-z_$][\w$-]*|\*)
+  | \[\s*(?P<bracket>(?:'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*"|[^\]'"])*?)\s*\]
+''', re.X)
+_PART = re.compile(r'''\s*('(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*"|[^,]+)\s*(?:,|$)''')
+
+
+def _selector(text, path):
+    text = text.strip()
+    if text == '*':
+        return ('wild',)
+    if text[:1] in ('"', "'"):
+        return ('name', ast.literal_eval(text))
+    if ':' in text:
+        try:
+            bounds = [int(part) if part.strip() else None for part in text.split(':')]
+        except ValueError:
+            bounds = None
+        if bounds is None or len(bounds) > 3 or bounds[2:3] == [0]:
+            raise ValueError(f'Invalid slice [{text}] in {path}')
+        return ('slice', slice(*bounds))
+    try:
+        return ('index', int(text))
+    except ValueError:
+        raise ValueError(f'Unsupported selector [{text}] in {path}')
+
+
+def parse(path):
+    """Compile a path into ``[(recursive, selectors)]`` steps."""
+    path = path.strip()
+    if not path.startswith('$'):
+        raise ValueError('Paths must start with $')
+    steps = []
+    position = 1
+    recursive = False
+    while position < len(path):
+        match = _TOKEN.match(path, position)
+        if match is None:
+            raise ValueError(f'Unexpected {path[position:position + 10]!r} in {path}')
+        position = match.end()
+        if match.group('deep'):
+            if recursive:
+                raise ValueError(f'Unexpected .. in {path}')
+            recursive = True
+            # In "..name" and "..*" the second dot doubles as the member's dot.
+            if path[position:position + 1] != '[':
+                position -= 1
+            continue
+        if match.group('name') is not None:
+            name = match.group('name')
+            selectors = [('wild',) if name == '*' else ('name', name)]
+        else:
+            parts = _PART.findall(match.group('bracket'))
+            if not parts:
+                raise ValueError(f'Empty selector in {path}')
+            selectors = [_selector(part, path) for part in parts]
+        steps.append((recursive, selectors))
+        recursive = False
+    if recursive:
+        raise ValueError(f'Path cannot end with .. in {path}')
+    return steps
+
+
+def child_path(path, key):
+    if isinstance(key, int):
+        return f'{path}[{key}]'
+    if _IDENTIFIER.fullmatch(key):
+        return f'{path}.{key}'
+    return f'{path}[{json.dumps(key, ensure_ascii=False)}]'
+
+
+def children(path, value):
+    if isinstance(value, dict):
+        for key, child in value.items():
+            yield child_path(path, key), child
+    elif isinstance(value, list):
+        for index, child in enumerate(value):
+            yield child_path(path, index), child
+
+
+def _descendants(path, value):
+    # Pre-order and iterative, so deeply nested documents cannot hit the recursion limit.
+    stack = [iter([(path, value)])]
+    while stack:
+        for node in stack[-1]:
+            yield node
+            stack.append(children(*node))
+            break
+        else:
+            stack.pop()
+
+
+def _select(path, value, selectors):
+    for selector in selectors:
+        kind = selector[0]
+        if kind == 'wild':
+            yield from children(path, value)
+        elif kind == 'name':
+            if isinstance(value, dict) and selector[1] in value:
+                yield child_path(path, selector[1]), value[selector[1]]
+        elif isinstance(value, list):
+            if kind == 'index':
+                index = selector[1] + len(value) if selector[1] < 0 else selector[1]
+                if 0 <= index < len(value):
+                    yield child_path(path, index), value[index]
+            else:
+                for index in range(*selector[1].indices(len(value))):
+                    yield child_path(path, index), value[index]
+
+
+def find(document, path):
+    """Yield ``(path, value)`` for every match of ``path`` in ``document``."""
+    nodes = iter([('$', document)])
+    for recursive, selectors in parse(path):
+        nodes = _step(nodes, recursive, selectors)
+    return nodes
+
+
+def _step(nodes, recursive, selectors):
+    for path, value in nodes:
+        if recursive:
+            for node in _descendants(path, value):
+                yield from _select(*node, selectors)
+        else:
+            yield from _select(path, value, selectors)
+
+
+def resolve(document, path):
+    """Return the single value at ``path``; raise KeyError if nothing matches."""
+    for _, value in find(document, path):
+        return value
+    raise KeyError(path)
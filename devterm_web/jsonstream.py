@@ -0,0 +1,292 @@
+"""DevTerm Web - Constant-memory JSON formatter and minifier.
+
+The formatter works on tokens rather than parsed objects: strings and numbers
+are copied through verbatim and only whitespace between tokens is rewritten.
+Memory use is bounded by the nesting depth, the indent, the longest number or
+literal and the output flush size, not by the document size.
+"""
+
+import codecs
+import re
+
+CHUNK_SIZE = 64 * 1024
+FLUSH_SIZE = 64 * 1024
+MAX_DEPTH = 1000
+MAX_INDENT = 16
+MAX_SCALAR = 4096
+
+# What the parser expects next outside of a token.
+VALUE, VALUE_OR_CLOSE, KEY, KEY_OR_CLOSE, COLON, AFTER = range(6)
+# Which token, if any, is being lexed across chunk boundaries.
+STRING, ESCAPE, UNICODE, SCALAR = range(1, 5)
+
+CLOSERS = {'{': '}', '[': ']'}
+HEX_DIGITS = frozenset('0123456789abcdefABCDEF')
+
+_whitespace = re.compile(r'[ \t\n\r]*')
+_string_body = re.compile(r'[^"\\\x00-\x1f]*')
+_scalar_body = re.compile(r'[-+.0-9a-zA-Z]*')
+_number = re.compile(r'-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?')
+
+
+class JsonStreamError(ValueError):
+    """Syntax error with the position of the offending character."""
+
+    def __init__(self, msg, offset, line, column):
+        super().__init__(f'{msg}: line {line} column {column} (char {offset})')
+        self.msg = msg
+        self.offset = offset
+        self.line = line
+        self.column = column
+
+
+class Reformatter:
+    """Incrementally re-indent (``indent=n``) or minify (``indent=None``) JSON text."""
+
+    def __init__(self, indent=2, max_depth=MAX_DEPTH):
+        self.indent = indent
+        self.max_depth = max_depth
+        self._colon = ':' if indent is None else ': '
+        self._stack = []
+        self._expect = VALUE
+        self._lex = None
+        self._key = False
+        self._hex = 0
+        self._scalar = []
+        self._scalar_len = 0
+        self._scalar_start = 0
+        self._pending_open = False
+        self._offset = 0
+        self._line = 1
+        self._line_start = 0
+        self._out = []
+        self._indented = 0
+
+    def _newline(self, depth):
+        # Indentation is the only output that grows faster than the input, so it is counted.
+        self._indented += 1 + self.indent * depth
+        return '\n' + ' ' * (self.indent * depth)
+
+    def _position(self, text, i):
+        offset = self._offset + i
+        newlines = text.count('\n', 0, max(i, 0))
+        if newlines:
+            return offset, self._line + newlines, i - text.rfind('\n', 0, i)
+        return offset, self._line, offset - self._line_start + 1
+
+    def _fail(self, msg, text, i):
+        raise JsonStreamError(msg, *self._position(text, i))
+
+    def _begin(self):
+        # A value or key follows "{" or "[", so the container is not empty.
+        if self._pending_open:
+            self._pending_open = False
+            if self.indent is not None:
+                self._out.append(self._newline(len(self._stack)))
+
+    def _close(self, char):
+        opener = self._stack.pop()
+        if self._pending_open or self.indent is None:
+            self._out.append(char)
+        else:
+            self._out.append(self._newline(len(self._stack)) + char)
+        self._pending_open = False
+        self._expect = AFTER
+        return opener
+
+    def _end_scalar(self, text, i):
+        token = ''.join(self._scalar)
+        self._scalar = []
+        self._lex = None
+        if token not in ('true', 'false', 'null') and not _number.fullmatch(token):
+            self._fail('Expecting value', text, self._scalar_start - self._offset)
+        self._out.append(token)
+        self._expect = AFTER
+
+    def feed(self, text):
+        """Consume a chunk of JSON text, yielding output as it passes FLUSH_SIZE.
+
+        Deeply nested input can expand into far more indentation than it
+        takes itself, so output is handed back during the chunk rather than
+        after it.
+        """
+        out = self._out
+        i = 0
+        n = len(text)
+        while i < n:
+            if self._indented >= FLUSH_SIZE:
+                yield self._flush()
+            lex = self._lex
+            if lex == STRING:
+                j = _string_body.match(text, i).end()
+                if j > i:
+                    out.append(text[i:j])
+                    i = j
+                if i == n:
+                    break
+                c = text[i]
+                if c == '"':
+                    self._lex = None
+                    self._expect = COLON if self._key else AFTER
+                elif c == '\\':
+                    self._lex = ESCAPE
+                else:
+                    self._fail('Invalid control character at', text, i)
+                out.append(c)
+                i += 1
+                continue
+            if lex == ESCAPE:
+                c = text[i]
+                if c == 'u':
+                    self._lex = UNICODE
+                    self._hex = 0
+                elif c in '"\\/bfnrt':
+                    self._lex = STRING
+                else:
+                    self._fail('Invalid \\escape', text, i)
+                out.append(c)
+                i += 1
+                continue
+            if lex == UNICODE:
+                c = text[i]
+                if c not in HEX_DIGITS:
+                    self._fail('Invalid \\uXXXX escape', text, i)
+                out.append(c)
+                i += 1
+                self._hex += 1
+                if self._hex == 4:
+                    self._lex = STRING
+                continue
+            if lex == SCALAR:
+                j = _scalar_body.match(text, i).end()
+                self._scalar.append(text[i:j])
+                self._scalar_len += j - i
+                if self._scalar_len > MAX_SCALAR:
+                    self._fail('Number or literal too long', text, self._scalar_start - self._offset)
+                i = j
+                if i == n:
+                    break
+                self._end_scalar(text, i)
+                continue
+
+            i = _whitespace.match(text, i).end()
+            if i == n:
+                break
+            c = text[i]
+            expect = self._expect
+            if expect == AFTER:
+                if not self._stack:
+                    self._fail('Extra data', text, i)
+                opener = self._stack[-1]
+                if c == ',':
+                    out.append(',' if self.indent is None else ',' + self._newline(len(self._stack)))
+                    self._expect = KEY if opener == '{' else VALUE
+                elif c == CLOSERS[opener]:
+                    self._close(c)
+                else:
+                    self._fail("Expecting ',' delimiter", text, i)
+                i += 1
+            elif expect == COLON:
+                if c != ':':
+                    self._fail("Expecting ':' delimiter", text, i)
+                out.append(self._colon)
+                self._expect = VALUE
+                i += 1
+            elif expect == KEY or expect == KEY_OR_CLOSE:
+                if c == '}' and expect == KEY_OR_CLOSE:
+                    self._close(c)
+                elif c == '"':
+                    self._begin()
+                    out.append(c)
+                    self._lex = STRING
+                    self._key = True
+                else:
+                    self._fail('Expecting property name enclosed in double quotes', text, i)
+                i += 1
+            elif c == ']' and expect == VALUE_OR_CLOSE:
+                self._close(c)
+                i += 1
+            elif c == '"':
+                self._begin()
+                out.append(c)
+                self._lex = STRING
+                self._key = False
+                i += 1
+            elif c == '{' or c == '[':
+                if len(self._stack) >= self.max_depth:
+                    self._fail('Maximum nesting depth exceeded', text, i)
+                self._begin()
+                out.append(c)
+                self._stack.append(c)
+                self._pending_open = True
+                self._expect = KEY_OR_CLOSE if c == '{' else VALUE_OR_CLOSE
+                i += 1
+            elif c in '-0123456789tfn':
+                # Numbers and literals are buffered until a delimiter arrives.
+                self._begin()
+                self._lex = SCALAR
+                self._scalar_len = 0
+                self._scalar_start = self._offset + i
+            else:
+                self._fail('Expecting value', text, i)
+
+        newlines = text.count('\n')
+        if newlines:
+            self._line += newlines
+            self._line_start = self._offset + text.rfind('\n') + 1
+        self._offset += n
+        output = self._flush()
+        if output:
+            yield output
+
+    def close(self):
+        """Finish the document, raising JsonStreamError if it is incomplete."""
+        if self._lex == SCALAR:
+            self._end_scalar('', 0)
+        if self._lex is not None:
+            self._fail('Unterminated string', '', 0)
+        if self._stack and self._expect == AFTER:
+            self._fail("Expecting ',' delimiter", '', 0)
+        if self._stack or self._expect != AFTER:
+            self._fail('Expecting value', '', 0)
+        return self._flush()
+
+    def _flush(self):
+        output = ''.join(self._out)
+        self._out.clear()
+        self._indented = 0
+        return output
+
+
+def check_indent(value):
+    indent = int(value)
+    if not 0 <= indent <= MAX_INDENT:
+        raise ValueError(f'indent must be between 0 and {MAX_INDENT}')
+    return indent
+
+
+def reformat(chunks, indent=2, encoding='utf-8'):
+    """Reformat an iterable of byte chunks, yielding text in FLUSH_SIZE blocks."""
+    decoder = codecs.getincrementaldecoder(encoding)(errors='strict')
+    formatter = Reformatter(indent)
+    pending = []
+    size = 0
+    for chunk in chunks:
+        for output in formatter.feed(decoder.decode(chunk)):
+            pending.append(output)
+            size += len(output)
+            if size >= FLUSH_SIZE:
+                yield ''.join(pending)
+                pending = []
+                size = 0
+    pending.extend(formatter.feed(decoder.decode(b'', final=True)))
+    pending.append(formatter.close())
+    yield ''.join(pending)
+
+
+def read_chunks(stream, chunk_size=CHUNK_SIZE):
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
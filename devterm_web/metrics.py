@@ -0,0 +1,149 @@
+"""DevTerm Web - Per-tool request metrics in Prometheus text format."""
+
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+
+from flask import g, request
+
+# Latency buckets in seconds, from sub-millisecond tools to slow HTTP probes.
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def tool_label():
+    """Name requests by route, e.g. "hash" for /api/hash; unmatched URLs share one label."""
+    rule = request.url_rule
+    if rule is None:
+        return 'unmatched'
+    path = rule.rule
+    return path[len('/api/'):] if path.startswith('/api/') else path
+
+
+class Metrics:
+    """Thread-safe counters and latency histograms keyed by tool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.requests = defaultdict(int)
+            self.errors = defaultdict(int)
+            self.in_flight = defaultdict(int)
+            self.request_bytes = defaultdict(int)
+            self.response_bytes = defaultdict(int)
+            self.buckets = defaultdict(lambda: [0] * (len(BUCKETS) + 1))
+            self.duration_sum = defaultdict(float)
+
+    def init_app(self, app):
+        app.before_request(self._before)
+        app.after_request(self._after)
+        app.teardown_request(self._teardown)
+
+    def _before(self):
+        tool = tool_label()
+        g.metrics_tool = tool
+        g.metrics_started = time.perf_counter()
+        # A dict rather than a flag, so streamed bodies can still mark failure after _after has run.
+        g.metrics_state = {'failed': False}
+        with self._lock:
+            self.in_flight[tool] += 1
+
+    def mark_failed(self):
+        """Count the current request as an error even though it returned 200."""
+        g.metrics_state['failed'] = True
+
+    def _after(self, response):
+        tool = g.pop('metrics_tool', None)
+        if tool is None:
+            return response
+        started = g.metrics_started
+        state = g.metrics_state
+        status = response.status_code
+        received = request.content_length or 0
+        counter = {'bytes': 0}
+
+        if response.is_streamed:
+            # Count streamed bodies as they are sent and time them to the end.
+            def counting(chunks):
+                try:
+                    for chunk in chunks:
+                        counter['bytes'] += len(chunk)
+                        yield chunk
+                except Exception:
+                    state['failed'] = True
+                    raise
+
+            response.response = counting(response.response)
+        else:
+            counter['bytes'] = response.calculate_content_length() or 0
+
+        def record():
+            self.observe(tool, status, time.perf_counter() - started, received, counter['bytes'], state['failed'])
+
+        response.call_on_close(record)
+        return response
+
+    def _teardown(self, exc):
+        # Requests that raised never reach after_request.
+        tool = g.pop('metrics_tool', None)
+        if tool is not None:
+            self.observe(tool, 500, time.perf_counter() - g.metrics_started, request.content_length or 0, 0, True)
+
+    def observe(self, tool, status, seconds, received, sent, failed):
+        with self._lock:
+            self.in_flight[tool] -= 1
+            self.requests[(tool, status)] += 1
+            if failed or status >= 400:
+                self.errors[tool] += 1
+            self.request_bytes[tool] += received
+            self.response_bytes[tool] += sent
+            self.buckets[tool][bisect_left(BUCKETS, seconds)] += 1
+            self.duration_sum[tool] += seconds
+
+    def render(self):
+        """Return all metrics in the Prometheus text exposition format."""
+        with self._lock:
+            lines = [
+                '# HELP devterm_requests_total Requests handled, by tool and HTTP status.',
+                '# TYPE devterm_requests_total counter',
+            ]
+            for (tool, status), count in sorted(self.requests.items()):
+                lines.append(f'devterm_requests_total{{tool="{tool}",status="{status}"}} {count}')
+            lines += [
+                '# HELP devterm_errors_total Failed requests: HTTP errors, exceptions and tool failures.',
+                '# TYPE devterm_errors_total counter',
+            ]
+            lines += [f'devterm_errors_total{{tool="{tool}"}} {count}' for tool, count in sorted(self.errors.items())]
+            lines += [
+                '# HELP devterm_requests_in_flight Requests currently being handled.',
+                '# TYPE devterm_requests_in_flight gauge',
+            ]
+            lines += [f'devterm_requests_in_flight{{tool="{tool}"}} {count}' for tool, count in sorted(self.in_flight.items())]
+            lines += [
+                '# HELP devterm_request_bytes_total Request body bytes received.',
+                '# TYPE devterm_request_bytes_total counter',
+            ]
+            lines += [f'devterm_request_bytes_total{{tool="{tool}"}} {count}' for tool, count in sorted(self.request_bytes.items())]
+            lines += [
+                '# HELP devterm_response_bytes_total Response body bytes sent.',
+                '# TYPE devterm_response_bytes_total counter',
+            ]
+            lines += [f'devterm_response_bytes_total{{tool="{tool}"}} {count}' for tool, count in sorted(self.response_bytes.items())]
+            lines += [
+                '# HELP devterm_request_duration_seconds Time from request start to the end of the response body.',
+                '# TYPE devterm_request_duration_seconds histogram',
+            ]
+            for tool, counts in sorted(self.buckets.items()):
+                cumulative = 0
+                for bound, count in zip(BUCKETS + ('+Inf',), counts):
+                    cumulative += count
+                    lines.append(f'devterm_request_duration_seconds_bucket{{tool="{tool}",le="{bound}"}} {cumulative}')
+                lines.append(f'devterm_request_duration_seconds_sum{{tool="{tool}"}} {self.duration_sum[tool]:.6f}')
+                lines.append(f'devterm_request_duration_seconds_count{{tool="{tool}"}} {cumulative}')
+        return '\n'.join(lines) + '\n'
+
+
+metrics = Metrics()
@@ -0,0 +1,98 @@
+"""DevTerm Web - Bulk password generation from buffered OS randomness."""
+
+import math
+import os
+
+CLASSES = {
+    'uppercase': 'ABCDEFGHIJKLMNOPQRSTUVWXYZ',
+    'lowercase': 'abcdefghijklmnopqrstuvwxyz',
+    'digits': '0123456789',
+    'special': '!@#$%^&*()_+-=[]{}|;:,.<>?',
+}
+
+BLOCK_SIZE = 64 * 1024
+MAX_LENGTH = 10000
+MAX_COUNT = 1000000
+
+
+class Policy:
+    """Character classes to draw from and whether each must appear at least once."""
+
+    def __init__(self, classes, length=16, require=False):
+        self.classes = [CLASSES[name] for name in CLASSES if name in classes]
+        if not self.classes:
+            raise ValueError('Select at least one character type')
+        if not 1 <= length <= MAX_LENGTH:
+            raise ValueError(f'Length must be between 1 and {MAX_LENGTH}')
+        if require and length < len(self.classes):
+            raise ValueError('Length is shorter than the number of required character types')
+        self.charset = ''.join(self.classes)
+        self.length = length
+        self.require = require
+
+    @classmethod
+    def from_params(cls, params):
+        classes = [name for name in CLASSES if params.get(name)]
+        return cls(classes, int(params.get('length', 16)), bool(params.get('require')))
+
+    def entropy_bits(self):
+        """Entropy of one password, i.e. log2 of the number of passwords the policy allows."""
+        if not self.require:
+            return self.length * math.log2(len(self.charset))
+        # Inclusion-exclusion over the classes that would be missing.
+        valid = 0
+        for mask in range(1 << len(self.classes)):
+            missing = sum(len(chars) for i, chars in enumerate(self.classes) if mask >> i & 1)
+            sign = -1 if bin(mask).count('1') % 2 else 1
+            valid += sign * (len(self.charset) - missing) ** self.length
+        return math.log2(valid)
+
+    def accepts(self, password):
+        return not self.require or all(any(c in password for c in chars) for chars in self.classes)
+
+
+class ByteSampler:
+    """Uniform characters from a charset, drawn from large os.urandom blocks.
+
+    Bytes at or above the largest multiple of the charset size are rejected so
+    every character is equally likely. A single ``bytes.translate`` call both
+    maps accepted bytes to characters and drops rejected ones.
+    """
+
+    def __init__(self, charset, block_size=BLOCK_SIZE):
+        size = len(charset)
+        if not 1 <= size <= 256:
+            raise ValueError('Charset must have between 1 and 256 characters')
+        limit = 256 - 256 % size
+        encoded = charset.encode('latin-1')
+        self._table = bytes(encoded[b % size] if b < limit else 0 for b in range(256))
+        self._rejected = bytes(range(limit, 256))
+        self._block_size = block_size
+        self._buffer = b''
+        self._pos = 0
+
+    def draw(self, count):
+        while len(self._buffer) - self._pos < count:
+            fresh = os.urandom(max(self._block_size, count)).translate(self._table, self._rejected)
+            self._buffer = self._buffer[self._pos:] + fresh
+            self._pos = 0
+        chars = self._buffer[self._pos:self._pos + count]
+        self._pos += count
+        return chars.decode('latin-1')
+
+
+def parse_count(value):
+    count = int(value)
+    if not 1 <= count <= MAX_COUNT:
+        raise ValueError(f'Count must be between 1 and {MAX_COUNT}')
+    return count
+
+
+def generate(policy, count=1):
+    """Yield ``count`` passwords; whole passwords are redrawn until the policy accepts them."""
+    sampler = ByteSampler(policy.charset)
+    for _ in range(count):
+        password = sampler.draw(policy.length)
+        while not policy.accepts(password):
+            password = sampler.draw(policy.length)
+        yield password
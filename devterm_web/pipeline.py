@@ -0,0 +1,256 @@
+"""DevTerm Web - In-process tool pipelines.
+
+A pipeline is an ordered list of ``{"tool": name, "params": {...}}`` steps.
+Each step receives the previous step's value as it is - bytes, text or a
+parsed document - so intermediate results are never re-serialized into JSON
+strings between tools. Values are only coerced when a step needs another
+kind: text is UTF-8 encoded for byte steps, bytes are decoded for text
+steps, and parsed documents are dumped as JSON.
+"""
+
+import base64
+import contextlib
+import io
+import json
+import os
+import re
+import threading
+import time
+import urllib.parse
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+from devterm_web import b64stream, hashing
+from devterm_web.tools import text
+
+MAX_STEPS = 32
+NAME_PATTERN = re.compile(r'[A-Za-z0-9_.-]{1,64}')
+
+
+def is_document(value):
+    return not isinstance(value, (str, bytes))
+
+
+def as_text(value):
+    if isinstance(value, str):
+        return value
+    if isinstance(value, bytes):
+        try:
+            return value.decode()
+        except UnicodeDecodeError:
+            raise ValueError(f'Expected text but got {len(value)} bytes of binary')
+    return json.dumps(value, ensure_ascii=False, default=str)
+
+
+def as_bytes(value):
+    return value if isinstance(value, bytes) else as_text(value).encode()
+
+
+# Steps take (value, params) and return the next value.
+
+def url_encode(value, params):
+    return urllib.parse.quote(as_text(value), safe='')
+
+
+def url_decode(value, params):
+    return urllib.parse.unquote(as_text(value))
+
+
+def base64_encode(value, params):
+    variant = params.get('variant', 'standard')
+    return b''.join(b64stream.encode_stream(io.BytesIO(as_bytes(value)), variant)).decode('ascii')
+
+
+def base64_decode(value, params):
+    variant = params.get('variant', 'standard')
+    return b''.join(b64stream.decode_stream(io.BytesIO(as_bytes(value)), variant))
+
+
+def parse_document(value, params):
+    if is_document(value):
+        return value
+    from devterm_web import convert
+    return convert.loads(convert.check_format(params.get('format', 'json')), as_text(value))
+
+
+def format_json(value, params):
+    document = value if is_document(value) else json.loads(as_text(value))
+    return text.dump_json(document, params.get('mode', 'format'))
+
+
+def convert_document(value, params):
+    from devterm_web import convert
+    document = parse_document(value, {'format': params.get('from', 'json')})
+    return convert.dumps(convert.check_format(params.get('to', 'yaml')), document)
+
+
+def hash_value(value, params):
+    return hashing.hash_bytes(as_bytes(value), hashing.parse_algorithms(params.get('algorithms')))
+
+
+def convert_case(value, params):
+    return text.convert_case({'data': as_text(value), 'type': params.get('type', 'lower')})['output']
+
+
+def qr_code(value, params):
+    from devterm_web import qr
+    _, body = qr.render(as_text(value), qr.parse_options(params))
+    return body
+
+
+STEPS = {
+    'url/encode': url_encode,
+    'url/decode': url_decode,
+    'base64/encode': base64_encode,
+    'base64/decode': base64_decode,
+    'parse': parse_document,
+    'json/format': format_json,
+    'convert': convert_document,
+    'hash': hash_value,
+    'case': convert_case,
+    'qrcode': qr_code,
+}
+
+
+def compile_steps(steps):
+    """Validate a step list up front and return ``[(tool, function, params)]``."""
+    if not isinstance(steps, list) or not steps:
+        raise ValueError('steps must be a non-empty list of {tool, params} objects')
+    if len(steps) > MAX_STEPS:
+        raise ValueError(f'Pipelines are limited to {MAX_STEPS} steps')
+    compiled = []
+    for index, step in enumerate(steps, 1):
+        name = step.get('tool') if isinstance(step, dict) else None
+        if name not in STEPS:
+            raise ValueError(f'Step {index}: unknown tool {name}')
+        params = step.get('params') or {}
+        if not isinstance(params, dict):
+            raise ValueError(f'Step {index}: params must be an object')
+        compiled.append((name, STEPS[name], params))
+    return compiled
+
+
+def render(value):
+    """Shape the final value as tool output; binary results come back as Base64."""
+    if isinstance(value, bytes):
+        try:
+            return {'output': value.decode()}
+        except UnicodeDecodeError:
+            return {'output': base64.b64encode(value).decode('ascii'), 'encoding': 'base64'}
+    if isinstance(value, str):
+        return {'output': value}
+    return {'output': json.dumps(value, indent=2, ensure_ascii=False, default=str), 'result': value}
+
+
+def run(steps, data, timings=False):
+    """Run compiled steps over ``data`` and return a tool result.
+
+    A failing step stops the pipeline; the error names the step (1-based).
+    """
+    value = data
+    times = []
+    started = time.perf_counter()
+    for index, (name, step, params) in enumerate(steps, 1):
+        step_started = time.perf_counter()
+        try:
+            value = step(value, params)
+        except Exception as e:
+            return {'success': False, 'error': f'Step {index} ({name}): {e}', 'step': index}
+        times.append({'tool': name, 'ms': round((time.perf_counter() - step_started) * 1000, 3)})
+    result = {'success': True, **render(value)}
+    if timings:
+        result['timings'] = times
+        result['total_ms'] = round((time.perf_counter() - started) * 1000, 3)
+    return result
+
+
+class Library:
+    """Named pipelines, defined once and run by name.
+
+    Definitions are kept in a JSON file of ``{name: steps}``
+    (``DEVTERM_PIPELINES``). Every worker process re-reads the file when it
+    changes, so a pipeline defined through one worker runs in all of them.
+    Without a file there are no named pipelines.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self._pipelines = {}
+        self._version = None
+        self._lock = threading.Lock()
+        if path:
+            with self._lock:
+                self._refresh()
+
+    def define(self, name, steps):
+        if not NAME_PATTERN.fullmatch(str(name)):
+            raise ValueError('Pipeline names are 1-64 letters, digits, ".", "_" or "-"')
+        compiled = compile_steps(steps)
+        self._update(lambda definitions: definitions.__setitem__(name, steps))
+        return compiled
+
+    def get(self, name):
+        with self._lock:
+            self._refresh()
+            entry = self._pipelines.get(name)
+        if entry is None:
+            raise ValueError(f'Unknown pipeline: {name}')
+        return entry[1]
+
+    def remove(self, name):
+        return self._update(lambda definitions: definitions.pop(name, None) is not None)
+
+    def describe(self):
+        with self._lock:
+            self._refresh()
+            return {name: steps for name, (steps, _) in self._pipelines.items()}
+
+    def _read(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def _refresh(self):
+        # Called with the lock held; a stat per lookup keeps workers in step with the file.
+        if not self.path:
+            return
+        try:
+            info = os.stat(self.path)
+            version = (info.st_mtime_ns, info.st_size, info.st_ino)
+        except FileNotFoundError:
+            version = None
+        if version != self._version:
+            definitions = self._read()
+            self._pipelines = {name: (steps, compile_steps(steps)) for name, steps in definitions.items()}
+            self._version = version
+
+    def _update(self, change):
+        if not self.path:
+            raise LookupError('Named pipelines are defined in the DEVTERM_PIPELINES file, which is not set')
+        with self._lock, _file_lock(f'{self.path}.lock'):
+            definitions = self._read()
+            result = change(definitions)
+            temporary = f'{self.path}.{os.getpid()}.tmp'
+            with open(temporary, 'w', encoding='utf-8') as f:
+                json.dump(definitions, f, indent=2)
+            os.replace(temporary, self.path)
+            self._version = None
+            self._refresh()
+        return result
+
+
+@contextlib.contextmanager
+def _file_lock(path):
+    """Serialize read-modify-write cycles on the definitions file across processes."""
+    with open(path, 'a') as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        yield
+
+
+library = Library(os.environ.get('DEVTERM_PIPELINES'))
@@ -0,0 +1,62 @@
+"""DevTerm Web - On-demand sampling profiler with collapsed-stack output."""
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+MAX_SECONDS = 60
+MIN_INTERVAL = 0.001
+
+# Only one profile at a time: overlapping samplers would skew each other.
+_running = threading.Lock()
+
+
+def _frame_name(frame):
+    code = frame.f_code
+    return f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})'
+
+
+def sample(seconds, interval=0.005, exclude=()):
+    """Sample every thread's stack for ``seconds`` and count identical stacks.
+
+    Returns a Counter of root-first frame tuples. Threads in ``exclude`` (and
+    the sampling thread itself) are skipped.
+    """
+    names = {thread.ident: thread.name for thread in threading.enumerate()}
+    skip = set(exclude) | {threading.get_ident()}
+    stacks = Counter()
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        for ident, frame in sys._current_frames().items():
+            if ident in skip:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_name(frame))
+                frame = frame.f_back
+            if ident not in names:
+                names.update((thread.ident, thread.name) for thread in threading.enumerate())
+            stack.append(names.get(ident, f'thread-{ident}'))
+            stacks[tuple(reversed(stack))] += 1
+        time.sleep(interval)
+    return stacks
+
+
+def collapse(stacks):
+    """Format stacks as "frame;frame;frame count" lines for flamegraph tools."""
+    return ''.join(f'{";".join(stack)} {count}\n' for stack, count in stacks.most_common())
+
+
+def profile(seconds, interval=0.005):
+    """Run one profile, or return None if another is already running."""
+    seconds = max(0.0, min(float(seconds), MAX_SECONDS))
+    # A sample interval longer than the profile would only hold the sampler (and the lock) asleep.
+    interval = max(MIN_INTERVAL, min(float(interval), seconds))
+    if not _running.acquire(blocking=False):
+        return None
+    try:
+        return collapse(sample(seconds, interval))
+    finally:
+        _running.release()
@@ -0,0 +1,141 @@
+"""DevTerm Web - QR code rendering with a content-addressed cache."""
+
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+
+import qrcode
+from qrcode.constants import ERROR_CORRECT_H, ERROR_CORRECT_L, ERROR_CORRECT_M, ERROR_CORRECT_Q
+
+ERROR_CORRECTION = {
+    'L': ERROR_CORRECT_L,
+    'M': ERROR_CORRECT_M,
+    'Q': ERROR_CORRECT_Q,
+    'H': ERROR_CORRECT_H,
+}
+
+MIMETYPES = {
+    'png': 'image/png',
+    'svg': 'image/svg+xml',
+}
+
+
+class RenderCache:
+    """Thread-safe LRU of rendered images, bounded by entry count and bytes."""
+
+    def __init__(self, max_entries=256, max_bytes=16 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            body = self._entries.get(key)
+            if body is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return body
+
+    def put(self, key, body):
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = body
+            self._bytes += len(body)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+cache = RenderCache()
+
+
+def parse_options(params):
+    """Validate rendering options, raising ValueError on bad input."""
+    fmt = str(params.get('format', 'png')).lower()
+    if fmt not in MIMETYPES:
+        raise ValueError(f'Unsupported format: {fmt}')
+    ec = str(params.get('ec', 'M')).upper()
+    if ec not in ERROR_CORRECTION:
+        raise ValueError(f'Unsupported error correction level: {ec}')
+    try:
+        box_size = int(params.get('size', 10))
+        border = int(params.get('border', 4))
+    except (TypeError, ValueError):
+        raise ValueError('size and border must be integers')
+    if not 1 <= box_size <= 50:
+        raise ValueError('size must be between 1 and 50')
+    if not 0 <= border <= 20:
+        raise ValueError('border must be between 0 and 20')
+    return {'format': fmt, 'ec': ec, 'size': box_size, 'border': border}
+
+
+def cache_key(data, options):
+    digest = hashlib.sha256(data.encode())
+    digest.update(f'|{options["format"]}|{options["ec"]}|{options["size"]}|{options["border"]}'.encode())
+    return digest.hexdigest()
+
+
+def _build(data, options):
+    qr = qrcode.QRCode(version=1, box_size=options['size'], border=options['border'],
+                       error_correction=ERROR_CORRECTION[options['ec']])
+    qr.add_data(data)
+    qr.make(fit=True)
+    return qr
+
+
+def _to_png(qr):
+    img = qr.make_image(fill_color="black", back_color="white")
+    buffer = io.BytesIO()
+    img.save(buffer, format='PNG')
+    return buffer.getvalue()
+
+
+def _to_svg(qr, box_size):
+    # get_matrix() already includes the border; dark runs on each row are
+    # merged into one rectangle so the path stays small.
+    matrix = qr.get_matrix()
+    side = len(matrix)
+    path = []
+    for y, row in enumerate(matrix):
+        x = 0
+        while x < side:
+            if not row[x]:
+                x += 1
+                continue
+            start = x
+            while x < side and row[x]:
+                x += 1
+            path.append(f'M{start} {y}h{x - start}v1h-{x - start}z')
+    pixels = side * box_size
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{pixels}" height="{pixels}" '
+        f'viewBox="0 0 {side} {side}" shape-rendering="crispEdges">'
+        f'<rect width="{side}" height="{side}" fill="#fff"/>'
+        f'<path fill="#000" d="{"".join(path)}"/></svg>'
+    ).encode()
+
+
+def render(data, options):
+    """Return ``(etag, body)`` for a QR image, rendering only on cache miss."""
+    key = cache_key(data, options)
+    body = cache.get(key)
+    if body is None:
+        qr = _build(data, options)
+        body = _to_svg(qr, options['size']) if options['format'] == 'svg' else _to_png(qr)
+        cache.put(key, body)
+    return key, body
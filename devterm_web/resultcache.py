@@ -0,0 +1,270 @@
+"""DevTerm Web - Content-addressed result cache for deterministic tools.
+
+Results are keyed by a SHA-256 of the tool name and its canonical JSON
+parameters, and stored as encoded JSON so every hit returns a fresh dict
+and sizes are known exactly. Lookups try a per-process LRU first, then an
+optional SQLite file that every worker process on the node shares.
+
+Configured from the environment: ``DEVTERM_CACHE_MB`` (memory budget, 0
+turns caching off), ``DEVTERM_CACHE_TTL`` (seconds) and ``DEVTERM_CACHE_DIR``
+(directory for the shared tier; unset keeps the cache per process).
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_MB = 32
+DEFAULT_TTL = 3600
+SHARED_FILE = 'results.sqlite3'
+
+
+def cache_key(tool, params):
+    canonical = json.dumps(params, sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str)
+    return hashlib.sha256(f'{tool}\0{canonical}'.encode()).hexdigest()
+
+
+class MemoryTier:
+    """Thread-safe LRU of encoded results, bounded by bytes, with a TTL."""
+
+    def __init__(self, max_bytes, ttl):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def size(self):
+        return self._bytes
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, blob = entry
+            if expires <= time.monotonic():
+                del self._entries[key]
+                self._bytes -= len(blob)
+                return None
+            self._entries.move_to_end(key)
+            return blob
+
+    def put(self, key, blob, ttl=None):
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old[1])
+            self._entries[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), blob)
+            self._bytes += len(blob)
+            while self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+class SharedTier:
+    """SQLite file shared by the worker processes on one node.
+
+    The shared tier is best effort: database errors (e.g. a busy lock held
+    by another process) count as misses and never fail a request. Expired
+    rows, and the oldest rows once the file exceeds its budget, are pruned
+    every ``PRUNE_EVERY`` writes.
+    """
+
+    PRUNE_EVERY = 256
+
+    def __init__(self, directory, max_bytes, ttl):
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, SHARED_FILE)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.errors = 0
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+        self._inherited = []
+
+    @property
+    def _db(self):
+        # Connections must not cross fork (e.g. gunicorn --preload), so each
+        # process opens its own on first use. An inherited connection is kept
+        # open but unused: closing it would drop this process's file locks.
+        # Called with the lock held.
+        if self._pid != os.getpid():
+            if self._conn is not None:
+                self._inherited.append(self._conn)
+            db = sqlite3.connect(self.path, timeout=0.5, isolation_level=None, check_same_thread=False)
+            db.execute('PRAGMA journal_mode=WAL')
+            db.execute('PRAGMA synchronous=NORMAL')
+            db.execute('CREATE TABLE IF NOT EXISTS results '
+                       '(key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL NOT NULL)')
+            self._conn, self._pid = db, os.getpid()
+        return self._conn
+
+    def get(self, key):
+        """Return ``(blob, seconds_left)`` or None."""
+        now = time.time()
+        try:
+            with self._lock:
+                row = self._db.execute('SELECT value, expires FROM results WHERE key = ? AND expires > ?',
+                                       (key, now)).fetchone()
+        except sqlite3.Error:
+            self.errors += 1
+            return None
+        return None if row is None else (row[0], row[1] - now)
+
+    def put(self, key, blob):
+        try:
+            with self._lock:
+                self._db.execute('INSERT OR REPLACE INTO results VALUES (?, ?, ?)', (key, blob, time.time() + self.ttl))
+                self._writes += 1
+                if self._writes % self.PRUNE_EVERY == 0:
+                    self._prune()
+        except sqlite3.Error:
+            self.errors += 1
+
+    def _prune(self):
+        self._db.execute('DELETE FROM results WHERE expires <= ?', (time.time(),))
+        total = self._db.execute('SELECT COALESCE(SUM(LENGTH(value)), 0) FROM results').fetchone()[0]
+        if total > self.max_bytes:
+            # Rows expiring soonest were written first; drop them until a tenth under budget.
+            excess = total - self.max_bytes * 9 // 10
+            self._db.execute('DELETE FROM results WHERE key IN (SELECT key FROM (SELECT key, '
+                             'SUM(LENGTH(value)) OVER (ORDER BY expires ROWS UNBOUNDED PRECEDING) - LENGTH(value) '
+                             'AS before FROM results) WHERE before < ?)', (excess,))
+
+    def clear(self):
+        try:
+            with self._lock:
+                self._db.execute('DELETE FROM results')
+        except sqlite3.Error:
+            self.errors += 1
+
+    def close(self):
+        with self._lock:
+            if self._pid == os.getpid():
+                self._conn.close()
+            self._conn = self._pid = None
+
+
+class ResultCache:
+    """Memoize tool results in a memory tier backed by an optional shared tier."""
+
+    def __init__(self, max_bytes=DEFAULT_MB * 1024 * 1024, ttl=DEFAULT_TTL, shared_dir=None):
+        self.max_entry = max(max_bytes // 8, 1)
+        self.memory = MemoryTier(max_bytes, ttl)
+        self.shared = SharedTier(shared_dir, max_bytes * 4, ttl) if shared_dir else None
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self):
+        with self._lock:
+            self.hits = {'memory': 0, 'shared': 0}
+            self.misses = 0
+            self.skipped = 0
+
+    def _count(self, outcome):
+        with self._lock:
+            if outcome in self.hits:
+                self.hits[outcome] += 1
+            elif outcome == 'miss':
+                self.misses += 1
+            else:
+                self.skipped += 1
+
+    def lookup(self, tool, params, compute):
+        """Return the cached result for ``tool(params)``, computing and storing it on a miss.
+
+        Only successful results are stored, and only if they fit in an
+        eighth of the memory budget.
+        """
+        key = cache_key(tool, params)
+        blob = self.memory.get(key)
+        if blob is not None:
+            self._count('memory')
+            return json.loads(blob)
+        if self.shared is not None:
+            found = self.shared.get(key)
+            if found is not None:
+                blob, ttl = found
+                self.memory.put(key, blob, ttl)
+                self._count('shared')
+                return json.loads(blob)
+        result = compute(tool, params)
+        if not result.get('success', True):
+            self._count('skip')
+            return result
+        blob = json.dumps(result, separators=(',', ':')).encode()
+        if len(blob) > self.max_entry:
+            self._count('skip')
+            return result
+        self._count('miss')
+        self.memory.put(key, blob)
+        if self.shared is not None:
+            self.shared.put(key, blob)
+        return result
+
+    def clear(self):
+        self.memory.clear()
+        if self.shared is not None:
+            self.shared.clear()
+
+    def render(self):
+        """Return cache statistics in the Prometheus text exposition format."""
+        with self._lock:
+            hits = dict(self.hits)
+            misses, skipped = self.misses, self.skipped
+        lines = [
+            '# HELP devterm_cache_hits_total Tool results served from the result cache, by tier.',
+            '# TYPE devterm_cache_hits_total counter',
+        ]
+        lines += [f'devterm_cache_hits_total{{tier="{tier}"}} {count}' for tier, count in sorted(hits.items())]
+        lines += [
+            '# HELP devterm_cache_misses_total Tool results computed and stored.',
+            '# TYPE devterm_cache_misses_total counter',
+            f'devterm_cache_misses_total {misses}',
+            '# HELP devterm_cache_uncached_total Results computed but not stored (failures or too large).',
+            '# TYPE devterm_cache_uncached_total counter',
+            f'devterm_cache_uncached_total {skipped}',
+            '# HELP devterm_cache_evictions_total Memory tier entries evicted to stay within budget.',
+            '# TYPE devterm_cache_evictions_total counter',
+            f'devterm_cache_evictions_total {self.memory.evictions}',
+            '# HELP devterm_cache_entries Entries in the memory tier.',
+            '# TYPE devterm_cache_entries gauge',
+            f'devterm_cache_entries {len(self.memory)}',
+            '# HELP devterm_cache_bytes Bytes held by the memory tier.',
+            '# TYPE devterm_cache_bytes gauge',
+            f'devterm_cache_bytes {self.memory.size}',
+        ]
+        if self.shared is not None:
+            lines += [
+                '# HELP devterm_cache_shared_errors_total Shared tier operations that failed and were skipped.',
+                '# TYPE devterm_cache_shared_errors_total counter',
+                f'devterm_cache_shared_errors_total {self.shared.errors}',
+            ]
+        return '\n'.join(lines) + '\n'
+
+
+def from_env(environ=os.environ):
+    """Build the cache described by DEVTERM_CACHE_* settings, or None if disabled."""
+    megabytes = float(environ.get('DEVTERM_CACHE_MB', DEFAULT_MB))
+    if megabytes <= 0:
+        return None
+    ttl = float(environ.get('DEVTERM_CACHE_TTL', DEFAULT_TTL))
+    return ResultCache(int(megabytes * 1024 * 1024), ttl, environ.get('DEVTERM_CACHE_DIR') or None)
@@ -0,0 +1,88 @@
+"""DevTerm Web - Command-line entry point.
+
+Two serving modes are available:
+
+``threaded``
+    Werkzeug's threaded server, one OS thread per request.
+``async``
+    gevent's WSGI server. Sockets are made cooperative, so a request waiting
+    on a slow upstream (the HTTP Client tools) parks a greenlet instead of
+    holding a thread, and thousands of them can be in flight at once.
+    CPU-bound tools are offloaded to a pool of native threads so they never
+    stall the event loop that the other requests share. Needs the ``async``
+    extra (gevent).
+"""
+
+import argparse
+import os
+
+MODES = ('threaded', 'async')
+MAX_CONNECTIONS = 10000
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='devterm-web', description='Serve the DevTerm Web utilities.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5000)
+    parser.add_argument('--mode', choices=MODES, default='threaded')
+    parser.add_argument('--cpu-workers', type=int, default=os.cpu_count() or 1,
+                        help='native threads for CPU-bound tools in async mode')
+    parser.add_argument('--max-connections', type=int, default=MAX_CONNECTIONS,
+                        help='concurrent connections accepted in async mode')
+    parser.add_argument('--warmup', default=None,
+                        help='tools to import at startup, comma-separated or "all" (sets DEVTERM_WARMUP)')
+    parser.add_argument('--debug', action='store_true', help='debug mode (threaded mode only)')
+    args = parser.parse_args(argv)
+    if args.mode == 'async' and args.debug:
+        parser.error('--debug is only supported in threaded mode')
+    if args.cpu_workers < 1 or args.max_connections < 1:
+        parser.error('--cpu-workers and --max-connections must be at least 1')
+    return args
+
+
+def serve_threaded(args):
+    from devterm_web.app import app
+    app.run(host=args.host, port=args.port, threaded=True, debug=args.debug)
+
+
+def serve_async(args):
+    # Patch before the app (and requests, via the lazy tool registry) imports
+    # socket, ssl or threading, so every later import sees the cooperative versions.
+    from gevent import monkey
+    monkey.patch_all()
+    from gevent.pool import Pool
+    from gevent.pywsgi import WSGIServer
+    from gevent.threadpool import ThreadPool
+
+    from devterm_web import hashing
+    from devterm_web.app import app
+    from devterm_web.tools import registry
+
+    hashing.parallel = False
+    cpu_pool = ThreadPool(args.cpu_workers)
+    registry.offload = lambda tool, params: cpu_pool.apply(tool, (params,))
+    server = WSGIServer((args.host, args.port), app, spawn=Pool(args.max_connections))
+    print(f'Serving DevTerm Web (async) on http://{args.host}:{args.port}', flush=True)
+    try:
+        server.serve_forever()
+    finally:
+        registry.offload = None
+        cpu_pool.kill()
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.warmup is not None:
+        os.environ['DEVTERM_WARMUP'] = args.warmup
+    if args.mode == 'async':
+        try:
+            import gevent  # noqa: F401
+        except ImportError:
+            raise SystemExit('Async mode needs gevent: pip install "devterm-web[async]"')
+        serve_async(args)
+    else:
+        serve_threaded(args)
+
+
+if __name__ == '__main__':
+    main()
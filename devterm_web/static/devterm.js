@@ -0,0 +1,205 @@
+function showTool(tool) {
+    document.querySelectorAll('.tool-section').forEach(el => el.classList.remove('active'));
+    document.getElementById('tools-grid').style.display = tool ? 'none' : 'grid';
+    if (tool) document.getElementById(tool).classList.add('active');
+}
+
+async function formatJson() {
+    const input = document.getElementById('json-input').value;
+    const response = await fetch('/api/json/format', {
+        method: 'POST',
+        headers: {'Content-Type': 'application/json'},
+        body: JSON.stringify({data: input, mode: 'format'})
+    });
+    const result = await response.json();
+    document.getElementById('json-output').textContent = result.output || result.error;
+    document.getElementById('json-output').className = 'output ' + (result.success ? 'success' : 'error');
+}
+
+async function minifyJson() {
+    const input = document.getElementById('json-input').value;
+    const response = await fetch('/api/json/format', {
+        method: 'POST',
+        headers: {'Content-Type': 'application/json'},
+        body: JSON.stringify({data: input, mode: 'minify'})
+    });
+    const result = await response.json();
+    document.getElementById('json-output').textContent = result.output || result.error;
+    document.getElementById('json-output').className = 'output ' + (result.success ? 'success' : 'error');
+}
+
+async function convertFormat() {
+    const input = document.getElementById('convert-input').value;
+    const from = document.getElementById('convert-from').value;
+    const to = document.getElementById('convert-to').value;
+    const response = await fetch('/api/convert', {method: 'POST', headers: {'Content-Type': 'application/json'}, body: JSON.stringify({data: input, from, to})});
+    const result = await response.json();
+    document.getElementById('convert-output').textContent = result.output || result.error;
+    document.getElementById('convert-output').className = 'output ' + (result.success ? 'success' : 'error');
+}
+
+async function base64Encode() {
+    const input = document.getElementById('base64-input').value;
+    const response = await fetch('/api/base64/encode', {method: 'POST', headers: {'Content-Type': 'application/json'}, body: JSON.stringify({data: input})});
+    const result = await response.json();
+    document.getElementById('base64-output').textContent = result.output || result.error;
+}
+
+async function base64Decode() {
+    const input = document.getElementById('base64-input').value;
+    const response = await fetch('/api/base64/decode', {method: 'POST', headers: {'Content-Type': 'application/json'}, body: JSON.stringify({data: input})});
+    const result = await response.json();
+    document.getElementById('base64-output').textContent = result.output || result.error;
+}
+
+async function base64File(direction) {
+    const file = document.getElementById('base64-file').files[0];
+    const output = document.getElementById('base64-output');
+    if (!file) {
+        output.textContent = 'Choose a file first';
+        return;
+    }
+    const form = new FormData();
+    form.append('file', file);
+    const response = await fetch('/api/base64/' + direction + '/stream', {method: 'POST', body: form});
+    if (!response.ok) {
+        const result = await response.json();
+        output.textContent = result.error;
+        return;
+    }
+    const match = (response.headers.get('Content-Disposition') || '').match(/filename="(.*)"/);
+    const link = document.createElement('a');
+    let blob;
+    try {
+        blob = await response.blob();
+    } catch (e) {
+        // The server drops the connection when the input turns out to be invalid mid-stream.
+        output.textContent = 'Download failed: the input is invalid or the connection was lost';
+        return;
+    }
+    link.href = URL.createObjectURL(blob);
+    link.download = match ? match[1] : 'download';
+    link.click();
+    URL.revokeObjectURL(link.href);
+    output.textContent = 'Downloaded ' + link.download;
+}
+
+async function urlEncode() {
+    const input = document.getElementById('url-input').value;
+    const response = await fetch('/api/url/encode', {method: 'POST', headers: {'Content-Type': 'application/json'}, body: JSON.stringify({data: input})});
+    const result = await response.json();
+    document.getElementById('url-output').textContent = result.output || result.error;
+}
+
+async function urlDecode() {
+    const input = document.getElementById('url-input').value;
+    const response = await fetch('/api/url/decode', {method: 'POST', headers: {'Content-Type': 'application/json'}, body: JSON.stringify({data: input})});
+    const result = await response.json();
+    document.getElementById('url-output').textContent = result.output || result.error;
+}
+
+async function generateHash() {
+    const input = document.getElementById('hash-input').value;
+    const response = await fetch('/api/hash', {method: 'POST', headers: {'Content-Type': 'application/json'}, body: JSON.stringify({data: input})});
+    const result = await response.json();
+    document.getElementById('hash-output').textContent = result.output || result.error;
+}
+
+function generateUuid() {
+    document.getElementById('uuid-output').textContent = crypto.randomUUID();
+    document.getElementById('uuid-output').className = 'output success';
+}
+
+async function generatePassword() {
+    const length = document.getElementById('pw-length').value;
+    const upper = document.getElementById('pw-upper').checked;
+    const lower = document.getElementById('pw-lower').checked;
+    const digits = document.getElementById('pw-digits').checked;
+    const special = document.getElementById('pw-special').checked;
+
+    const response = await fetch('/api/password', {
+        method: 'POST',
+        headers: {'Content-Type': 'application/json'},
+        body: JSON.stringify({length, uppercase: upper, lowercase: lower, digits: digits, special: special})
+    });
+    const result = await response.json();
+    document.getElementById('password-output').textContent = result.output || result.error;
+}
+
+async function generateQr() {
+    const input = document.getElementById('qr-input').value;
+    const response = await fetch('/api/qrcode?format=svg&data=' + encodeURIComponent(input));
+    if (response.ok) {
+        const img = document.createElement('img');
+        img.src = URL.createObjectURL(await response.blob());
+        img.alt = 'QR Code';
+        document.getElementById('qr-output').replaceChildren(img);
+    } else {
+        const result = await response.json();
+        document.getElementById('qr-output').textContent = result.error;
+    }
+}
+
+async function makeRequest() {
+    const url = document.getElementById('http-url').value;
+    const method = document.getElementById('http-method').value;
+    const body = document.getElementById('http-body').value;
+    const output = document.getElementById('http-output');
+    output.textContent = '';
+
+    const response = await fetch('/api/http/stream', {
+        method: 'POST',
+        headers: {'Content-Type': 'application/json'},
+        body: JSON.stringify({url, method, body})
+    });
+    if (!response.ok) {
+        output.textContent = (await response.json()).error;
+        return;
+    }
+    // Server-sent events arrive as each phase completes; the body is shown as it streams in.
+    let phases = '', head = '', text = '', buffer = '';
+    const handlers = {
+        dns: data => phases += `DNS: ${data.ms} ms (${data.addresses.join(', ')})\n`,
+        connect: data => phases += `Connect: ${data.ms} ms (${data.address})\n`,
+        tls: data => phases += `TLS: ${data.ms} ms (${data.version}, ${data.cipher})\n`,
+        headers: data => {
+            phases += `First byte: ${data.ms} ms\n`;
+            head = `\nStatus: ${data.status} ${data.reason}\n\nHeaders:\n` +
+                data.headers.map(([k, v]) => `${k}: ${v}\n`).join('') + '\nBody:\n';
+        },
+        body: data => text += data.text,
+        done: data => phases += `Transfer: ${data.timings.transfer_ms} ms\nTotal: ${data.timings.total_ms} ms` +
+            (data.truncated ? ' (body truncated)' : '') + '\n',
+        error: data => phases += `Error: ${data.error}\n`
+    };
+    const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+    for (;;) {
+        const {value, done} = await reader.read();
+        if (done) break;
+        buffer += value;
+        let end;
+        while ((end = buffer.indexOf('\n\n')) !== -1) {
+            const block = buffer.slice(0, end);
+            buffer = buffer.slice(end + 2);
+            const event = block.match(/^event: (.*)$/m)[1];
+            handlers[event](JSON.parse(block.match(/^data: (.*)$/m)[1]));
+        }
+        output.textContent = phases + head + text;
+    }
+}
+
+async function convertCase() {
+    const input = document.getElementById('case-input').value;
+    const caseType = document.getElementById('case-type').value;
+    const response = await fetch('/api/case', {method: 'POST', headers: {'Content-Type': 'application/json'}, body: JSON.stringify({data: input, type: caseType})});
+    const result = await response.json();
+    document.getElementById('case-output').textContent = result.output || result.error;
+}
+
+function showTimestamp() {
+    const now = new Date();
+    document.getElementById('timestamp-output').innerHTML = 
+        'Unix: ' + Math.floor(now.getTime() / 1000) + '<br>' +
+        'ISO: ' + now.toISOString() + '<br>' +
+        'Local: ' + now.toString();
+}
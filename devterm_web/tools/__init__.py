@@ -0,0 +1,107 @@
+"""DevTerm Web - Lazily loaded tool registry.
+
+Tools are registered as ``module:function`` strings and imported the first
+time they are used, so importing the app does not pull in qrcode/PIL, yaml,
+xmltodict or requests until a request needs them.
+
+Servers that run requests on an event loop can set ``registry.offload`` to
+move CPU-bound tools onto a thread pool; tools in IO_BOUND always run inline
+because they spend their time waiting on sockets. Results of DETERMINISTIC
+tools are memoized when ``registry.cache`` is set (see resultcache).
+"""
+
+import importlib
+import threading
+import time
+
+# Tool names are the route paths below /api/.
+TOOL_SPECS = {
+    'json/format': 'devterm_web.tools.text:format_json',
+    'base64/encode': 'devterm_web.tools.text:encode_base64',
+    'base64/decode': 'devterm_web.tools.text:decode_base64',
+    'url/encode': 'devterm_web.tools.text:encode_url',
+    'url/decode': 'devterm_web.tools.text:decode_url',
+    'case': 'devterm_web.tools.text:convert_case',
+    'hash': 'devterm_web.tools.crypto:compute_hashes',
+    'password': 'devterm_web.tools.crypto:generate_password',
+    'uuid': 'devterm_web.tools.ids:generate_uuids',
+    'qrcode': 'devterm_web.tools.images:render_qr_code',
+    'http': 'devterm_web.tools.network:send_http_request',
+    'http/multi': 'devterm_web.tools.network:send_http_requests',
+    'convert': 'devterm_web.tools.formats:convert_document',
+    'pipeline': 'devterm_web.tools.pipelines:run_pipeline',
+}
+
+IO_BOUND = ('http', 'http/multi')
+
+# Pure functions of their parameters, safe to serve from the result cache.
+DETERMINISTIC = ('hash', 'json/format', 'case', 'url/encode', 'url/decode', 'qrcode')
+
+
+class ToolRegistry:
+    """Map tool names to callables, importing each tool's module on first use."""
+
+    def __init__(self, specs, io_bound=(), deterministic=()):
+        self.specs = dict(specs)
+        self.io_bound = frozenset(io_bound)
+        self.deterministic = frozenset(deterministic)
+        self.offload = None
+        self.cache = None
+        self.load_times = {}
+        self._loaded = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, name):
+        return name in self.specs
+
+    def names(self):
+        return list(self.specs)
+
+    def loaded(self):
+        return list(self._loaded)
+
+    def get(self, name):
+        tool = self._loaded.get(name)
+        if tool is not None:
+            return tool
+        module_name, _, attr = self.specs[name].partition(':')
+        with self._lock:
+            if name not in self._loaded:
+                started = time.perf_counter()
+                module = importlib.import_module(module_name)
+                self._loaded[name] = getattr(module, attr)
+                self.load_times[name] = time.perf_counter() - started
+        return self._loaded[name]
+
+    def run(self, name, params):
+        if self.cache is not None and name in self.deterministic:
+            return self.cache.lookup(name, params, self._call)
+        return self._call(name, params)
+
+    def _call(self, name, params):
+        tool = self.get(name)
+        if self.offload is None or name in self.io_bound:
+            return tool(params)
+        return self.offload(tool, params)
+
+    def run_cpu(self, fn, *args):
+        """Run CPU-bound work that is not a tool, through ``offload`` when it is set."""
+        if self.offload is None:
+            return fn(*args)
+        return self.offload(lambda _: fn(*args), None)
+
+    def warm_up(self, names):
+        """Load tools ahead of time from a list or comma-separated string ("all" loads everything)."""
+        if isinstance(names, str):
+            names = [name.strip() for name in names.split(',') if name.strip()]
+        if 'all' in names:
+            names = self.names()
+        unknown = [name for name in names if name not in self.specs]
+        if unknown:
+            raise ValueError(f'Unknown tool: {", ".join(unknown)}')
+        for name in names:
+            self.get(name)
+        return list(names)
+
+
+registry = ToolRegistry(TOOL_SPECS, IO_BOUND, DETERMINISTIC)
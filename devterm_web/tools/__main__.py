@@ -0,0 +1,89 @@
+"""Report the import time and memory each tool adds to a cold app.
+
+Usage: python -m devterm_web.tools [--json] [TOOL ...]
+
+Every tool is loaded in a fresh interpreter after ``devterm_web.app`` has been
+imported, so the numbers show what first use costs on a cold worker.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+HEAVY_MODULES = ('qrcode', 'PIL', 'yaml', 'xmltodict', 'requests', 'toml')
+
+
+def current_rss_kb():
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') // 1024
+    except (OSError, ValueError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def probe(name):
+    """Measure importing the app and then loading one tool, in this process."""
+    rss_start = current_rss_kb()
+    started = time.perf_counter()
+    import devterm_web.app  # noqa: F401
+    from devterm_web.tools import registry
+    app_seconds = time.perf_counter() - started
+    rss_app = current_rss_kb()
+    before = set(sys.modules)
+    started = time.perf_counter()
+    if name:
+        registry.get(name)
+    tool_seconds = time.perf_counter() - started
+    added = {module.split('.')[0] for module in set(sys.modules) - before}
+    return {
+        'tool': name or '(app)',
+        'app_import_ms': round(app_seconds * 1000, 1),
+        'tool_import_ms': round(tool_seconds * 1000, 1),
+        'app_rss_kb': rss_app - rss_start,
+        'tool_rss_kb': current_rss_kb() - rss_app,
+        'heavy_modules': sorted(added.intersection(HEAVY_MODULES)),
+    }
+
+
+def main(argv=None):
+    from devterm_web.tools import TOOL_SPECS
+
+    parser = argparse.ArgumentParser(prog='python -m devterm_web.tools', description=__doc__.splitlines()[0])
+    parser.add_argument('tools', nargs='*', help='tools to report on (default: all)')
+    parser.add_argument('--json', action='store_true', help='print machine-readable JSON')
+    parser.add_argument('--probe', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.probe is not None:
+        print(json.dumps(probe(args.probe)))
+        return 0
+
+    unknown = [name for name in args.tools if name not in TOOL_SPECS]
+    if unknown:
+        parser.error(f'unknown tool: {", ".join(unknown)}')
+    rows = []
+    for name in [''] + (args.tools or list(TOOL_SPECS)):
+        output = subprocess.run([sys.executable, '-m', 'devterm_web.tools', '--probe', name],
+                                check=True, capture_output=True, text=True).stdout
+        rows.append(json.loads(output))
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return 0
+    print(f'{"tool":<14} {"import ms":>10} {"RSS KiB":>9}  heavy modules')
+    for row in rows:
+        if row['tool'] == '(app)':
+            print(f'{row["tool"]:<14} {row["app_import_ms"]:>10} {row["app_rss_kb"]:>9}')
+        else:
+            print(f'{row["tool"]:<14} {row["tool_import_ms"]:>10} {row["tool_rss_kb"]:>9}  '
+                  f'{", ".join(row["heavy_modules"]) or "-"}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,32 @@
+"""DevTerm Web - Hashing and password tools."""
+
+from devterm_web import hashing, passwords
+
+MAX_JSON_CHARS = 16 * 1024 * 1024
+
+
+def compute_hashes(params):
+    data = params.get('data', '')
+    try:
+        algorithms = hashing.parse_algorithms(params.get('algorithms'))
+    except ValueError as e:
+        return {'success': False, 'error': str(e)}
+    digests = hashing.hash_bytes(data.encode(), algorithms)
+    return {'success': True, 'output': hashing.format_digests(digests), 'digests': digests}
+
+
+def generate_password(params):
+    try:
+        policy = passwords.Policy.from_params(params)
+        count = passwords.parse_count(params.get('count', 1))
+    except ValueError as e:
+        return {'success': False, 'error': str(e)}
+    # Larger batches should use the streamed text format.
+    if count * policy.length > MAX_JSON_CHARS:
+        return {'success': False, 'error': f'JSON responses are limited to {MAX_JSON_CHARS} characters; use stream: true'}
+
+    generated = list(passwords.generate(policy, count))
+    result = {'success': True, 'output': '\n'.join(generated), 'entropy_bits': round(policy.entropy_bits(), 2)}
+    if count > 1:
+        result['passwords'] = generated
+    return result
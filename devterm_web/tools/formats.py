@@ -0,0 +1,11 @@
+"""DevTerm Web - Format conversion tool."""
+
+from devterm_web import convert
+
+
+def convert_document(params):
+    try:
+        output = convert.convert(params.get('data', ''), params.get('from', 'json'), params.get('to', 'yaml'))
+    except Exception as e:
+        return {'success': False, 'error': str(e)}
+    return {'success': True, 'output': output}
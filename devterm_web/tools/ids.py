@@ -0,0 +1,22 @@
+"""DevTerm Web - UUID tool."""
+
+from devterm_web import uuids
+
+MAX_JSON_COUNT = 100000
+
+
+def generate_uuids(params):
+    try:
+        # Larger batches should use the streamed text/NDJSON formats.
+        if str(params.get('version', 4)) == '5':
+            # uuids.generate reports names that are not a list.
+            names = params.get('names')
+            size = len(names) if isinstance(names, list) else 1
+        else:
+            size = int(params.get('count', 1))
+        if size > MAX_JSON_COUNT:
+            return {'success': False, 'error': f'JSON responses are limited to {MAX_JSON_COUNT} UUIDs; use format=text or ndjson'}
+        values = ''.join(uuids.generate(params)).splitlines()
+    except (TypeError, ValueError) as e:
+        return {'success': False, 'error': str(e)}
+    return {'success': True, 'output': '\n'.join(values), 'uuids': values}
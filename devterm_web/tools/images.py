@@ -0,0 +1,17 @@
+"""DevTerm Web - QR code tool."""
+
+import base64
+
+from devterm_web import qr
+
+
+def render_qr_code(params):
+    data = params.get('data', '')
+    try:
+        options = qr.parse_options({**params, 'format': 'png'})
+        _, png = qr.render(data, options)
+    except Exception as e:
+        return {'success': False, 'error': str(e)}
+    img_str = base64.b64encode(png).decode()
+
+    return {'success': True, 'image': f'data:image/png;base64,{img_str}'}
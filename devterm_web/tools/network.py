@@ -0,0 +1,24 @@
+"""DevTerm Web - HTTP client tools."""
+
+from devterm_web import httpclient
+
+
+def send_http_request(params):
+    if params.get('timings'):
+        # A fresh connection per request, so every phase can be measured.
+        from devterm_web import httptrace
+        return httptrace.send(params.get('url', ''), params.get('method', 'GET'), params.get('body', ''))
+    return httpclient.send(params.get('url', ''), params.get('method', 'GET'), params.get('body', ''))
+
+
+def send_http_requests(params):
+    specs = params.get('requests')
+    if not isinstance(specs, list):
+        return {'success': False, 'error': 'requests must be a list of {url, method, body} objects'}
+    if len(specs) > httpclient.MAX_REQUESTS:
+        return {'success': False, 'error': f'At most {httpclient.MAX_REQUESTS} requests can be sent at once'}
+    try:
+        concurrency = int(params.get('concurrency', httpclient.DEFAULT_CONCURRENCY))
+    except (TypeError, ValueError):
+        return {'success': False, 'error': 'concurrency must be a number'}
+    return {'success': True, 'results': httpclient.send_many(specs, concurrency)}
@@ -0,0 +1,14 @@
+"""DevTerm Web - Pipeline tool."""
+
+from devterm_web import pipeline
+
+
+def run_pipeline(params):
+    try:
+        if params.get('pipeline'):
+            steps = pipeline.library.get(params['pipeline'])
+        else:
+            steps = pipeline.compile_steps(params.get('steps'))
+    except ValueError as e:
+        return {'success': False, 'error': str(e)}
+    return pipeline.run(steps, params.get('data', ''), bool(params.get('timings')))
@@ -0,0 +1,71 @@
+"""DevTerm Web - Text tools: JSON formatting, Base64, URL encoding and case conversion."""
+
+import base64
+import json
+import re
+import urllib.parse
+
+
+def dump_json(value, mode='format'):
+    if mode == 'minify':
+        return json.dumps(value, separators=(',', ':'))
+    return json.dumps(value, indent=2)
+
+
+def format_json(params):
+    data = params.get('data', '')
+    try:
+        parsed = json.loads(data)
+    except json.JSONDecodeError as e:
+        return {'success': False, 'error': str(e)}
+    return {'success': True, 'output': dump_json(parsed, params.get('mode', 'format'))}
+
+
+def encode_base64(params):
+    data = params.get('data', '')
+    return {'success': True, 'output': base64.b64encode(data.encode()).decode()}
+
+
+def decode_base64(params):
+    data = params.get('data', '')
+    try:
+        decoded = base64.b64decode(data.encode())
+    except Exception as e:
+        return {'success': False, 'error': str(e)}
+    try:
+        return {'success': True, 'output': decoded.decode()}
+    except UnicodeDecodeError:
+        return {'success': False, 'error': f'Decoded data is {len(decoded)} bytes of binary; use /api/base64/decode/stream to download it'}
+
+
+def encode_url(params):
+    data = params.get('data', '')
+    return {'success': True, 'output': urllib.parse.quote(data, safe='')}
+
+
+def decode_url(params):
+    data = params.get('data', '')
+    return {'success': True, 'output': urllib.parse.unquote(data)}
+
+
+def convert_case(params):
+    data = params.get('data', '')
+    case_type = params.get('type', 'lower')
+
+    if case_type == 'upper':
+        output = data.upper()
+    elif case_type == 'lower':
+        output = data.lower()
+    elif case_type == 'title':
+        output = data.title()
+    elif case_type == 'camel':
+        words = re.findall(r'[A-Za-z]+', data)
+        output = words[0].lower() + ''.join(w.capitalize() for w in words[1:])
+    elif case_type == 'snake':
+        output = re.sub(r'[\W]+', '_', data).lower().strip('_')
+    elif case_type == 'kebab':
+        output = re.sub(r'[\W]+', '-', data).lower().strip('-')
+    else:
+        output = data
+
+    return {'success': True, 'output': output}
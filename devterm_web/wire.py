@@ -0,0 +1,232 @@
+"""DevTerm Web - Negotiated compression and MessagePack for the /api/ routes.
+
+Responses of at least ``min_size`` bytes are compressed with the best of
+zstd, brotli and gzip that the client lists in Accept-Encoding. Streamed
+responses (server-sent events, NDJSON, downloads) and formats that are
+already compressed, such as PNG, are sent as they are. Request bodies may be
+sent with ``Content-Encoding: gzip`` or ``zstd``; they are decompressed as
+they are read, so admission body limits apply to the decompressed size.
+
+Programmatic clients may also send MessagePack bodies
+(``Content-Type: application/msgpack``) and ask for MessagePack results
+(``Accept: application/msgpack``) instead of JSON.
+
+zstd needs the ``zstandard`` package and MessagePack the ``msgpack``
+package; without them those encodings are simply not offered.
+``DEVTERM_COMPRESS_MIN`` sets the size threshold in bytes, or ``off``.
+"""
+
+import gzip
+import io
+import os
+import zlib
+
+from flask import Request, has_request_context, jsonify, request
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.exceptions import BadRequest, RequestEntityTooLarge
+from werkzeug.utils import cached_property
+from werkzeug.wsgi import get_input_stream
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+DEFAULT_MIN_SIZE = 1024
+
+# Fast levels: these run on every response, unlike the precompressed assets.
+LEVELS = {'zstd': 3, 'br': 4, 'gzip': 5}
+
+COMPRESSIBLE = {
+    'application/json', 'application/x-ndjson', 'application/xml', 'application/yaml', 'application/toml',
+    'application/javascript', 'image/svg+xml',
+}
+
+MSGPACK_TYPES = ('application/msgpack', 'application/x-msgpack', 'application/vnd.msgpack')
+
+DECODE_ERRORS = (OSError, EOFError, zlib.error) + ((zstandard.ZstdError,) if zstandard is not None else ())
+
+
+def compress(data, encoding):
+    if encoding == 'zstd':
+        return zstandard.ZstdCompressor(level=LEVELS['zstd']).compress(data)
+    if encoding == 'br':
+        return brotli.compress(data, quality=LEVELS['br'])
+    return gzip.compress(data, compresslevel=LEVELS['gzip'], mtime=0)
+
+
+def response_encodings():
+    """Encodings offered for responses, in order of preference."""
+    return [encoding for encoding, available in (('zstd', zstandard), ('br', brotli), ('gzip', True)) if available]
+
+
+def request_encodings():
+    return ['gzip', 'zstd'] if zstandard is not None else ['gzip']
+
+
+def compressible(mimetype):
+    return mimetype.startswith('text/') and mimetype != 'text/event-stream' or mimetype in COMPRESSIBLE \
+        or mimetype in MSGPACK_TYPES
+
+
+class DecodedStream(io.RawIOBase):
+    """Decompress a request body as it is read.
+
+    Corrupt data is a 400, and decompressing past ``limit`` bytes a 413, so a
+    small body cannot expand without bound.
+    """
+
+    def __init__(self, decoder, limit=None):
+        self._decoder = decoder
+        self._limit = limit
+        self._read = 0
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        try:
+            count = self._decoder.readinto(buffer)
+        except DECODE_ERRORS as e:
+            raise BadRequest(f'Could not decompress the request body: {e}')
+        self._read += count
+        if self._limit is not None and self._read > self._limit:
+            raise RequestEntityTooLarge(f'The decompressed body is limited to {self._limit} bytes')
+        return count
+
+
+class ApiRequest(Request):
+    """Request that reads compressed bodies and treats MessagePack like JSON."""
+
+    @cached_property
+    def stream(self):
+        encoding = (self.content_encoding or 'identity').strip().lower()
+        if encoding == 'identity':
+            return super().stream
+        raw = get_input_stream(self.environ)
+        if encoding == 'gzip':
+            decoder = gzip.GzipFile(fileobj=raw, mode='rb')
+        elif encoding == 'zstd' and zstandard is not None:
+            decoder = zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True)
+        else:
+            raise BadRequest(f'Unsupported Content-Encoding: {encoding}')
+        return io.BufferedReader(DecodedStream(decoder, self.max_content_length))
+
+    @property
+    def is_json(self):
+        return super().is_json or self.mimetype in MSGPACK_TYPES
+
+    def get_json(self, force=False, silent=False, cache=True):
+        if msgpack is None or self.mimetype not in MSGPACK_TYPES:
+            return super().get_json(force=force, silent=silent, cache=cache)
+        if '_cached_msgpack' in self.__dict__:
+            return self._cached_msgpack
+        try:
+            value = msgpack.unpackb(self.get_data(cache=cache), raw=False)
+        except (ValueError, msgpack.UnpackException) as e:
+            if silent:
+                return None
+            return self.on_json_loading_failure(e)
+        if cache:
+            self._cached_msgpack = value
+        return value
+
+
+def api_request():
+    return has_request_context() and request.path.startswith('/api/')
+
+
+def wants_msgpack():
+    """Return the MessagePack type the client prefers over JSON, or None."""
+    if msgpack is None or not api_request():
+        return None
+    best = request.accept_mimetypes.best_match(('application/json',) + MSGPACK_TYPES)
+    return best if best in MSGPACK_TYPES else None
+
+
+class WireJSONProvider(DefaultJSONProvider):
+    """``jsonify`` that answers in MessagePack when an API client asks for it."""
+
+    def response(self, *args, **kwargs):
+        mimetype = wants_msgpack()
+        response = None
+        if mimetype is not None:
+            try:
+                body = msgpack.packb(self._prepare_response_obj(args, kwargs), default=self.default)
+                response = self._app.response_class(body, mimetype=mimetype)
+            except OverflowError:
+                # Integers beyond 64 bits have no MessagePack form; JSON carries them.
+                pass
+        if response is None:
+            response = super().response(*args, **kwargs)
+        if msgpack is not None and api_request():
+            response.vary.add('Accept')
+        return response
+
+
+class Wire:
+    """Request decompression and response compression for the /api/ routes."""
+
+    def __init__(self, min_size=DEFAULT_MIN_SIZE):
+        self.min_size = min_size
+
+    def init_app(self, app):
+        app.request_class = ApiRequest
+        app.json = WireJSONProvider(app)
+        app.before_request(self._before)
+        app.after_request(self._after)
+
+    def _before(self):
+        if not request.path.startswith('/api/'):
+            return None
+        encoding = (request.content_encoding or 'identity').strip().lower()
+        if encoding != 'identity' and encoding not in request_encodings():
+            return self._unsupported(f'Unsupported Content-Encoding: {encoding}; use {", ".join(request_encodings())}')
+        if request.mimetype in MSGPACK_TYPES and msgpack is None:
+            return self._unsupported('MessagePack bodies need the msgpack package on the server')
+        return None
+
+    def _unsupported(self, message):
+        response = jsonify({'success': False, 'error': message})
+        response.status_code = 415
+        return response
+
+    def _after(self, response):
+        if self.min_size is None or not request.path.startswith('/api/'):
+            return response
+        if response.is_streamed or response.direct_passthrough or response.content_encoding \
+                or not compressible(response.mimetype or '') or response.status_code in (204, 206, 304) \
+                or 'no-transform' in response.headers.get('Cache-Control', ''):
+            return response
+        data = response.get_data()
+        if len(data) < self.min_size:
+            return response
+        response.vary.add('Accept-Encoding')
+        encoding = request.accept_encodings.best_match(response_encodings())
+        if encoding is None:
+            return response
+        response.set_data(compress(data, encoding))
+        response.content_encoding = encoding
+        etag, _ = response.get_etag()
+        if etag:
+            # The compressed bytes differ but mean the same thing, so the tag becomes weak.
+            response.set_etag(etag, weak=True)
+        return response
+
+
+def load_min_size(environ=os.environ):
+    value = environ.get('DEVTERM_COMPRESS_MIN', str(DEFAULT_MIN_SIZE)).strip().lower()
+    return None if value == 'off' else int(value)
+
+
+wire = Wire(load_min_size())
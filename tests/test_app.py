@@ -0,0 +1,692 @@
+import base64
+import collections
+import gzip
+import hashlib
+import http.server
+import io
+import json
+import math
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+import urllib.parse
+import uuid
+
+import pytest
+
+from devterm_web import jsonstream, passwords
+from devterm_web.app import app
+from devterm_web.metrics import metrics
+from devterm_web.tools import TOOL_SPECS, ToolRegistry, registry
+
+
+@pytest.fixture
+def client():
+    app.config['TESTING'] = True
+    return app.test_client()
+
+
+def test_case_route(client) -> None:
+    response = client.post('/api/case', json={'data': 'hello world', 'type': 'snake'})
+    assert response.get_json() == {'success': True, 'output': 'hello_world'}
+
+
+def test_batch_streams_results_in_order(client) -> None:
+    items = [{'tool': 'url/encode', 'params': {'data': f'a b {i}'}} for i in range(50)]
+    items.append({'tool': 'base64/decode', 'params': {'data': 'YQ'}})
+    items.append({'tool': 'nope', 'params': {}})
+    response = client.post('/api/batch', json={'items': items, 'workers': 4})
+    assert response.mimetype == 'application/x-ndjson'
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [line['index'] for line in lines] == list(range(52))
+    assert lines[3] == {'index': 3, 'tool': 'url/encode', 'success': True, 'output': 'a%20b%203'}
+    assert lines[50]['success'] is False
+    assert lines[51]['error'] == 'Unknown tool: nope'
+
+
+def test_batch_rejects_non_list(client) -> None:
+    response = client.post('/api/batch', json={'items': 'x'})
+    assert response.status_code == 400
+    assert client.post('/api/batch', json={'items': [], 'workers': 'many'}).status_code == 400
+
+
+def test_hash_json_matches_hashlib(client) -> None:
+    result = client.post('/api/hash', json={'data': 'abc'}).get_json()
+    assert result['output'].splitlines()[1] == f'SHA-256: {hashlib.sha256(b"abc").hexdigest()}'
+
+
+def test_hash_streams_raw_and_multipart_bodies(client) -> None:
+    payload = os.urandom(3 * 1024 * 1024 + 17)
+    raw = client.post('/api/hash?algorithms=sha256,blake2b,sha3_256', data=payload,
+                      content_type='application/octet-stream').get_json()
+    assert raw['size'] == len(payload)
+    assert raw['digests'] == {
+        'sha256': hashlib.sha256(payload).hexdigest(),
+        'blake2b': hashlib.blake2b(payload).hexdigest(),
+        'sha3_256': hashlib.sha3_256(payload).hexdigest(),
+    }
+    upload = client.post('/api/hash?algorithms=md5', data={'file': (io.BytesIO(payload), 'a.bin')}).get_json()
+    assert upload['digests'] == {'md5': hashlib.md5(payload).hexdigest()}
+
+
+def test_hash_rejects_unknown_algorithm(client) -> None:
+    result = client.post('/api/hash', json={'data': 'abc', 'algorithms': ['crc32']}).get_json()
+    assert result == {'success': False, 'error': 'Unsupported algorithm: crc32'}
+    response = client.post('/api/hash?algorithms=crc32', data=b'abc', content_type='application/octet-stream')
+    assert response.status_code == 400
+    labelled = client.post('/api/hash', json={'data': 'abc', 'algorithms': ['SHA-256', 'sha3-256', 'sha256']}).get_json()
+    assert list(labelled['digests']) == ['sha256', 'sha3_256']
+
+
+def test_qrcode_get_serves_cached_image_with_etag(client) -> None:
+    png = client.get('/api/qrcode?data=hello')
+    assert png.mimetype == 'image/png'
+    assert png.data.startswith(b'\x89PNG')
+    svg = client.get('/api/qrcode?data=hello&format=svg&ec=H&size=4')
+    assert svg.mimetype == 'image/svg+xml'
+    assert svg.data.startswith(b'<svg')
+    assert svg.headers['ETag'] != png.headers['ETag']
+    cached = client.get('/api/qrcode?data=hello&format=svg&ec=H&size=4',
+                        headers={'If-None-Match': svg.headers['ETag']})
+    assert cached.status_code == 304
+
+
+def test_qrcode_get_rejects_bad_options(client) -> None:
+    response = client.get('/api/qrcode?data=x&format=gif')
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Unsupported format: gif'
+
+
+def test_qrcode_post_still_returns_data_uri(client) -> None:
+    result = client.post('/api/qrcode', json={'data': 'hello'}).get_json()
+    assert result['image'].startswith('data:image/png;base64,')
+
+
+@pytest.fixture
+def upstream():
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            body = (self.path.strip('/') or 'x').encode() * 100000
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    class Server(http.server.ThreadingHTTPServer):
+        def handle_error(self, request, client_address):
+            pass  # Clients that stop reading at their body limit reset the connection.
+
+    server = Server(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+
+
+def test_http_truncates_streamed_body(client, upstream) -> None:
+    result = client.post('/api/http', json={'url': f'{upstream}/a'}).get_json()
+    assert result['status'] == 200
+    assert result['truncated'] is True
+    assert result['output'].endswith('\nBody:\n' + 'a' * 2000)
+
+
+def test_http_multi_returns_results_in_order(client, upstream) -> None:
+    specs = [{'url': f'{upstream}/{c}'} for c in 'abcdef'] + [{'url': 'http://127.0.0.1:1/'}]
+    result = client.post('/api/http/multi', json={'requests': specs, 'concurrency': 3}).get_json()
+    assert [r['url'] for r in result['results']] == [s['url'] for s in specs]
+    assert all(r['success'] for r in result['results'][:6])
+    assert result['results'][6]['success'] is False
+    assert client.post('/api/http/multi', json={'requests': [], 'concurrency': 'x'}).get_json()['success'] is False
+    too_many = client.post('/api/http/multi', json={'requests': [{'url': upstream}] * 101}).get_json()
+    assert too_many == {'success': False, 'error': 'At most 100 requests can be sent at once'}
+
+
+def test_http_timings_report_each_phase(client, upstream) -> None:
+    result = client.post('/api/http', json={'url': f'{upstream}/a', 'timings': True}).get_json()
+    assert result['status'] == 200 and result['truncated'] is True
+    assert result['output'].endswith('\nBody:\n' + 'a' * 2000)
+    assert {'dns_ms', 'connect_ms', 'ttfb_ms', 'transfer_ms', 'total_ms'} <= set(result['timings'])
+
+
+def test_http_stream_sends_events_as_they_arrive(client, upstream) -> None:
+    response = client.post('/api/http/stream', json={'url': f'{upstream}/b'})
+    assert response.mimetype == 'text/event-stream'
+    events = [block.split('\n') for block in response.get_data(as_text=True).strip().split('\n\n')]
+    names = [lines[0].removeprefix('event: ') for lines in events]
+    assert names[:3] == ['dns', 'connect', 'headers'] and names[-1] == 'done' and 'body' in names
+    data = [json.loads(lines[1].removeprefix('data: ')) for lines in events]
+    assert ''.join(d['text'] for name, d in zip(names, data) if name == 'body') == 'b' * 100000
+    assert data[-1]['bytes'] == 100000 and data[-1]['truncated'] is False
+    assert client.post('/api/http/stream', json={'url': 'ftp://x'}).status_code == 400
+    # No simple cross-site request can start one: GET is gone and bodies must be JSON.
+    assert client.get(f'/api/http/stream?url={upstream}/b').status_code == 405
+    assert client.post('/api/http/stream', data={'url': f'{upstream}/b'}).status_code == 415
+    metrics.reset()
+    refused = client.post('/api/http/stream', json={'url': 'http://127.0.0.1:1/'})
+    assert refused.get_data(as_text=True).rstrip().split('\n\n')[-1].startswith('event: error')
+    refused.close()
+    assert metrics.errors['http/stream'] == 1
+
+
+def test_json_stream_formats_and_minifies(client) -> None:
+    doc = {'a': [1, 2.5, {'b': None}], 'c': {}, 'd': [], 'e': 'x y'}
+    body = json.dumps(doc).encode()
+    formatted = client.post('/api/json/stream', data=body, content_type='application/octet-stream')
+    assert formatted.get_data(as_text=True) == json.dumps(doc, indent=2)
+    minified = client.post('/api/json/stream?mode=minify', data={'file': (io.BytesIO(body), 'doc.json')})
+    assert minified.get_data(as_text=True) == json.dumps(doc, separators=(',', ':'))
+
+
+def test_json_stream_bounds_indentation(client) -> None:
+    assert client.post('/api/json/stream?indent=17', data=b'[1]', content_type='text/plain').status_code == 400
+    response = client.post('/api/json/stream?indent=16', data=b'[' * 999 + b']' * 999, content_type='text/plain')
+    chunks = list(response.response)
+    response.close()
+    assert max(map(len, chunks)) < 2 * jsonstream.FLUSH_SIZE
+    assert b''.join(chunks).startswith(b'[\n' + b' ' * 16 + b'[')
+
+
+def test_json_stream_reports_error_position(client) -> None:
+    response = client.post('/api/json/stream', data=b'{"a": [1,\n  2 3]}', content_type='text/plain')
+    assert response.status_code == 400
+    assert response.get_json() == {
+        'success': False,
+        'error': "Expecting ',' delimiter: line 2 column 5 (char 14)",
+        'offset': 14, 'line': 2, 'column': 5,
+    }
+
+
+@pytest.mark.parametrize('source', ['json', 'yaml', 'xml', 'toml'])
+@pytest.mark.parametrize('target', ['json', 'yaml', 'xml', 'toml'])
+def test_convert_round_trips_every_pair(client, source, target) -> None:
+    doc = {'config': {'name': 'devterm', 'port': '5000'}}
+    text = client.post('/api/convert', json={'data': json.dumps(doc), 'from': 'json', 'to': source}).get_json()['output']
+    converted = client.post('/api/convert', json={'data': text, 'from': source, 'to': target}).get_json()
+    assert converted['success'] is True
+    back = client.post('/api/convert', json={'data': converted['output'], 'from': target, 'to': 'json'}).get_json()
+    assert json.loads(back['output']) == doc
+
+
+def test_convert_stream_splits_yaml_documents_and_xml_items(client) -> None:
+    yaml_docs = client.post('/api/convert/stream?from=yaml&to=json', data=b'a: 1\n---\nb: [2, 3]\n',
+                            content_type='application/yaml')
+    assert yaml_docs.get_data(as_text=True) == '{"a": 1}\n{"b": [2, 3]}\n'
+    xml = b'<rows>' + b''.join(b'<row id="%d"><v>%d</v></row>' % (i, i) for i in range(200)) + b'</rows>'
+    rows = client.post('/api/convert/stream?from=xml&to=json&item_depth=2', data=xml, content_type='application/xml')
+    lines = rows.get_data(as_text=True).splitlines()
+    assert len(lines) == 200
+    assert json.loads(lines[7]) == {'@id': '7', 'v': '7'}
+
+
+def test_convert_reports_bad_input(client) -> None:
+    result = client.post('/api/convert', json={'data': '[1, 2]', 'from': 'json', 'to': 'toml'}).get_json()
+    assert result == {'success': False, 'error': 'TOML documents must be tables'}
+    response = client.post('/api/convert/stream?from=csv', data=b'', content_type='text/plain')
+    assert response.status_code == 400
+
+
+def test_app_import_defers_heavy_dependencies() -> None:
+    code = ('import sys, devterm_web.app; '
+            'print(sorted(m for m in ("qrcode", "PIL", "yaml", "xmltodict", "requests") if m in sys.modules))')
+    output = subprocess.run([sys.executable, '-c', code], check=True, capture_output=True, text=True).stdout
+    assert output.strip() == '[]'
+
+
+def test_registry_warm_up() -> None:
+    registry = ToolRegistry(TOOL_SPECS)
+    assert registry.warm_up('case, url/encode') == ['case', 'url/encode']
+    assert registry.loaded() == ['case', 'url/encode']
+    with pytest.raises(ValueError, match='Unknown tool: nope'):
+        registry.warm_up(['nope'])
+
+
+def test_registry_offloads_cpu_bound_tools() -> None:
+    registry = ToolRegistry(TOOL_SPECS, io_bound=['http'])
+    offloaded = []
+    registry.offload = lambda tool, params: offloaded.append(tool.__name__) or tool(params)
+    assert registry.run('case', {'data': 'a b', 'type': 'upper'})['output'] == 'A B'
+    assert registry.run('http', {'url': 'not a url'})['success'] is False
+    assert offloaded == ['convert_case']
+
+
+def test_server_arguments() -> None:
+    from devterm_web import server
+    args = server.parse_args(['--mode', 'async', '--port', '8080', '--cpu-workers', '2'])
+    assert (args.mode, args.port, args.cpu_workers) == ('async', 8080, 2)
+    with pytest.raises(SystemExit):
+        server.parse_args(['--mode', 'async', '--debug'])
+
+
+def test_index_is_precompressed_and_conditional(client) -> None:
+    plain = client.get('/')
+    assert plain.mimetype == 'text/html'
+    assert b'/assets/devterm.' in plain.data
+    gzipped = client.get('/', headers={'Accept-Encoding': 'gzip'})
+    assert gzipped.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(gzipped.data) == plain.data
+    assert 'Accept-Encoding' in gzipped.headers['Vary']
+    again = client.get('/', headers={'Accept-Encoding': 'gzip', 'If-None-Match': gzipped.headers['ETag']})
+    assert again.status_code == 304
+
+
+def test_assets_compress_on_first_request(client) -> None:
+    from devterm_web import assets
+    asset = assets.Asset(b'body { color: red; }' * 100, 'text/css')
+    assert asset.variants == {}
+    with app.test_request_context(headers={'Accept-Encoding': 'gzip'}):
+        from flask import request
+        response = asset.response(request, 60)
+    assert response.content_encoding == 'gzip' and list(asset.variants) == ['gzip']
+    assert assets.Asset(b'x', 'text/css').variant('gzip') == ('identity', b'x')
+
+
+def test_fingerprinted_assets_are_immutable(client) -> None:
+    page = client.get('/').get_data(as_text=True)
+    url = re.search(r'/assets/devterm\.\w+\.js', page).group()
+    response = client.get(url)
+    assert response.mimetype == 'text/javascript'
+    assert 'immutable' in response.headers['Cache-Control']
+    assert b'function showTool' in response.data
+    assert client.get('/assets/devterm.0000.js').status_code == 404
+
+
+def test_metrics_count_requests_bytes_and_errors(client) -> None:
+    metrics.reset()
+    # Metrics are recorded when the server closes the response.
+    client.post('/api/case', json={'data': 'abc', 'type': 'upper'}).close()
+    client.post('/api/base64/decode', json={'data': 'YQ'}).close()
+    streamed = client.post('/api/json/stream', data=b'[1, 2]', content_type='application/json-seq')
+    streamed.get_data()
+    streamed.close()
+    body = client.get('/metrics').get_data(as_text=True)
+    assert 'devterm_requests_total{tool="case",status="200"} 1' in body
+    assert 'devterm_errors_total{tool="base64/decode"} 1' in body
+    assert 'devterm_response_bytes_total{tool="json/stream"} 12' in body
+    assert 'devterm_request_duration_seconds_count{tool="case"} 1' in body
+    assert 'devterm_requests_in_flight{tool="case"} 0' in body
+
+
+def test_profiler_requires_admin_token(client, monkeypatch) -> None:
+    assert client.post('/admin/profile?seconds=0').status_code == 403
+    monkeypatch.setenv('DEVTERM_ADMIN_TOKEN', 'secret')
+    assert client.post('/admin/profile?seconds=0', headers={'Authorization': 'Bearer nope'}).status_code == 403
+    worker = threading.Thread(target=time.sleep, args=(0.5,), name='sleeper')
+    worker.start()
+    response = client.post('/admin/profile?seconds=0.1&interval=0.01', headers={'Authorization': 'Bearer secret'})
+    worker.join()
+    assert response.status_code == 200
+    assert re.search(r'^sleeper;.*run \(threading\.py:\d+\) \d+$', response.get_data(as_text=True), re.M)
+    admin = {'Authorization': 'Bearer secret'}
+    assert client.post('/admin/profile?seconds=1&interval=inf', headers=admin).status_code == 400
+    assert client.post('/admin/profile?seconds=nan', headers=admin).status_code == 400
+    started = time.monotonic()
+    assert client.post('/admin/profile?seconds=0.05&interval=1e9', headers=admin).status_code == 200
+    assert time.monotonic() - started < 5
+
+
+def test_password_bulk_with_required_classes(client) -> None:
+    result = client.post('/api/password', json={'length': 4, 'count': 200, 'uppercase': True, 'digits': True,
+                                                'special': True, 'require': True}).get_json()
+    assert len(result['passwords']) == 200
+    for password in result['passwords']:
+        assert len(password) == 4
+        assert any(c.isupper() for c in password) and any(c.isdigit() for c in password)
+        assert any(c in passwords.CLASSES['special'] for c in password)
+    # 62^4 minus the strings missing a class, by inclusion-exclusion.
+    valid = 62 ** 4 - 36 ** 4 - 52 ** 4 - 36 ** 4 + 10 ** 4 + 26 ** 4 + 26 ** 4
+    assert result['entropy_bits'] == round(math.log2(valid), 2)
+
+
+def test_password_stream_and_limits(client) -> None:
+    response = client.post('/api/password', json={'length': 12, 'count': 2500, 'lowercase': True, 'stream': True})
+    lines = response.get_data(as_text=True).splitlines()
+    assert len(lines) == 2500 and all(len(line) == 12 and line.islower() for line in lines)
+    assert float(response.headers['X-Entropy-Bits']) == pytest.approx(12 * math.log2(26), abs=0.01)
+    assert client.post('/api/password', json={'lowercase': True}).get_json()['output'].islower()
+    assert client.post('/api/password', json={'length': 16}).get_json()['error'] == 'Select at least one character type'
+
+
+def test_byte_sampler_is_unbiased() -> None:
+    counts = collections.Counter(passwords.ByteSampler('abc').draw(300000))
+    assert set(counts) == {'a', 'b', 'c'}
+    assert max(counts.values()) - min(counts.values()) < 3000
+
+
+def test_uuid_v4_and_v5(client) -> None:
+    result = client.post('/api/uuid', json={'count': 500}).get_json()
+    values = [uuid.UUID(value) for value in result['uuids']]
+    assert len(set(values)) == 500
+    assert all(value.version == 4 and value.variant == uuid.RFC_4122 for value in values)
+    named = client.get('/api/uuid?version=5&namespace=dns&name=example.com&name=devterm').get_json()
+    assert named['uuids'] == [str(uuid.uuid5(uuid.NAMESPACE_DNS, 'example.com')),
+                              str(uuid.uuid5(uuid.NAMESPACE_DNS, 'devterm'))]
+
+
+def test_uuid_v7_streams_monotonic_values(client) -> None:
+    body = client.get('/api/uuid?version=7&count=25000&format=text').get_data(as_text=True)
+    values = body.splitlines()
+    assert len(values) == 25000
+    assert values == sorted(values) and len(set(values)) == 25000
+    parsed = uuid.UUID(values[0])
+    assert parsed.version == 7 and parsed.variant == uuid.RFC_4122
+    assert abs((parsed.int >> 80) - time.time() * 1000) < 60000
+    ndjson = client.post('/api/uuid', json={'version': 7, 'count': 3, 'format': 'ndjson'}).get_data(as_text=True)
+    assert [uuid.UUID(json.loads(line)).version for line in ndjson.splitlines()] == [7, 7, 7]
+
+
+def test_uuid_rejects_bad_options(client) -> None:
+    assert client.post('/api/uuid', json={'version': 3}).get_json()['error'] == 'Unsupported UUID version: 3'
+    assert client.get('/api/uuid?version=5&name=x&format=text').status_code == 400
+    assert client.post('/api/uuid', json={'count': 'abc'}).get_json()['success'] is False
+    assert client.post('/api/uuid', json={'version': 5, 'namespace': 'dns', 'names': 3}).get_json()['success'] is False
+    assert client.post('/api/uuid', json={'format': 'text', 'count': None}).status_code == 400
+    assert client.post('/api/uuid', json={'format': 'ndjson', 'version': None}).status_code == 400
+
+
+@pytest.mark.parametrize('variant', ['standard', 'urlsafe', 'mime'])
+def test_base64_stream_round_trips_binary(client, variant) -> None:
+    payload = os.urandom(200000) + b'\xff\xfe\x00'
+    encoded = client.post(f'/api/base64/encode/stream?variant={variant}',
+                          data={'file': (io.BytesIO(payload), 'cert.der')})
+    assert encoded.headers['Content-Disposition'] == 'attachment; filename="cert.der.b64"'
+    expected = {'standard': base64.b64encode, 'urlsafe': base64.urlsafe_b64encode,
+                'mime': lambda data: base64.encodebytes(data).replace(b'\n', b'\r\n')}[variant](payload)
+    assert encoded.data == expected
+    decoded = client.post(f'/api/base64/decode/stream?variant={variant}', data=encoded.data,
+                          content_type='text/plain')
+    assert decoded.mimetype == 'application/octet-stream'
+    assert decoded.data == payload
+
+
+def test_base64_stream_rejects_invalid_input(client) -> None:
+    response = client.post('/api/base64/decode/stream', data=b'YWJj!!!!', content_type='text/plain')
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Invalid Base64 character at 4'
+    binary = client.post('/api/base64/decode', json={'data': base64.b64encode(b'\xff\xfe').decode()}).get_json()
+    assert binary['success'] is False and 'binary' in binary['error']
+    # Past the first chunk the status is sent, so the download is aborted rather than corrupted.
+    late = client.post('/api/base64/decode/stream', data=b'YWJj' * 200000 + b'!!!!', content_type='text/plain')
+    assert late.status_code == 200
+    with pytest.raises(ValueError, match='Invalid Base64 character at 800000'):
+        late.get_data()
+
+
+def test_pipeline_chains_tools_in_process(client) -> None:
+    encoded = urllib.parse.quote(base64.b64encode(b'{"a": [1, 2]}').decode(), safe='')
+    steps = [{'tool': 'url/decode'}, {'tool': 'base64/decode'}, {'tool': 'json/format', 'params': {'mode': 'minify'}}]
+    result = client.post('/api/pipeline', json={'steps': steps, 'data': encoded, 'timings': True}).get_json()
+    assert result['output'] == '{"a":[1,2]}'
+    assert [timing['tool'] for timing in result['timings']] == ['url/decode', 'base64/decode', 'json/format']
+    data = '{"name": "Zoë"}'
+    piped = client.post('/api/pipeline', json={'steps': [{'tool': 'json/format'}], 'data': data}).get_json()
+    assert piped['output'] == client.post('/api/json/format', json={'data': data}).get_json()['output']
+
+    steps = [{'tool': 'convert', 'params': {'from': 'yaml', 'to': 'json'}}, {'tool': 'hash', 'params': {'algorithms': 'sha256'}}]
+    result = client.post('/api/pipeline', json={'steps': steps, 'data': 'a: 1\n'}).get_json()
+    assert result['result'] == {'sha256': hashlib.sha256(b'{\n  "a": 1\n}').hexdigest()}
+
+
+def test_pipeline_reports_failing_step(client) -> None:
+    steps = [{'tool': 'base64/decode'}, {'tool': 'case', 'params': {'type': 'upper'}}]
+    result = client.post('/api/pipeline', json={'steps': steps, 'data': base64.b64encode(b'\xff').decode()}).get_json()
+    assert result['success'] is False and result['step'] == 2
+    assert result['error'].startswith('Step 2 (case): Expected text')
+    unknown = client.post('/api/pipeline', json={'steps': [{'tool': 'nope'}]}).get_json()
+    assert unknown['error'] == 'Step 1: unknown tool nope'
+
+
+def test_named_pipelines(client, monkeypatch, tmp_path) -> None:
+    from devterm_web import pipeline
+    steps = [{'tool': 'case', 'params': {'type': 'snake'}}, {'tool': 'url/encode'}]
+    admin = {'Authorization': 'Bearer secret'}
+    monkeypatch.setenv('DEVTERM_ADMIN_TOKEN', 'secret')
+    monkeypatch.setattr(pipeline, 'library', pipeline.Library())
+    assert client.put('/api/pipelines/slug', json={'steps': steps}, headers=admin).status_code == 409
+    assert client.get('/api/pipelines').get_json()['pipelines'] == {}
+    assert client.post('/api/pipelines/slug', json={'data': 'x'}).get_json()['error'] == 'Unknown pipeline: slug'
+    path = str(tmp_path / 'pipelines.json')
+    monkeypatch.setattr(pipeline, 'library', pipeline.Library(path))
+    assert client.put('/api/pipelines/slug', json={'steps': steps}).status_code == 403
+    assert client.put('/api/pipelines/slug', json={'steps': steps}, headers=admin).get_json()['success']
+    # Another worker sharing the file sees the definition.
+    assert pipeline.Library(path).describe() == {'slug': steps}
+    assert client.get('/api/pipelines').get_json()['pipelines']['slug'] == steps
+    assert client.post('/api/pipelines/slug', json={'data': 'Hello World'}).get_json()['output'] == 'hello_world'
+    assert client.put('/api/pipelines/bad name', json={'steps': steps}, headers=admin).status_code == 400
+    assert client.delete('/api/pipelines/slug', headers=admin).status_code == 200
+    assert client.post('/api/pipelines/slug', json={'data': 'x'}).get_json()['error'] == 'Unknown pipeline: slug'
+
+
+def test_result_cache_tiers(tmp_path) -> None:
+    from devterm_web import resultcache
+    calls = []
+
+    def compute(tool, params):
+        calls.append(tool)
+        return {'success': True, 'output': params['data'].upper()}
+
+    first = resultcache.ResultCache(1024 * 1024, 60, str(tmp_path))
+    second = resultcache.ResultCache(1024 * 1024, 60, str(tmp_path))
+    assert first.lookup('case', {'data': 'abc'}, compute)['output'] == 'ABC'
+    assert first.lookup('case', {'data': 'abc'}, compute)['output'] == 'ABC'
+    assert second.lookup('case', {'data': 'abc'}, compute)['output'] == 'ABC'
+    assert calls == ['case']
+    assert first.hits == {'memory': 1, 'shared': 0} and second.hits == {'memory': 0, 'shared': 1}
+    failed = second.lookup('case', {'data': 'x'}, lambda tool, params: {'success': False, 'error': 'no'})
+    assert failed['success'] is False and second.skipped == 1
+
+
+def test_shared_cache_reconnects_after_fork(tmp_path, monkeypatch) -> None:
+    from devterm_web import resultcache
+    shared = resultcache.SharedTier(str(tmp_path), 1024 * 1024, 60)
+    assert shared._conn is None
+    shared.put('k', b'v')
+    inherited = shared._conn
+    monkeypatch.setattr(resultcache.os, 'getpid', lambda: -1)
+    assert shared.get('k')[0] == b'v'
+    assert shared._conn is not inherited and shared._inherited == [inherited]
+
+
+def test_result_cache_eviction_and_ttl(tmp_path) -> None:
+    from devterm_web import resultcache
+    tier = resultcache.MemoryTier(max_bytes=10, ttl=60)
+    tier.put('a', b'12345')
+    tier.put('b', b'12345')
+    tier.get('a')
+    tier.put('c', b'12345')
+    assert (tier.get('a'), tier.get('b'), tier.evictions) == (b'12345', None, 1)
+    tier.put('d', b'1', ttl=0)
+    assert tier.get('d') is None
+
+    shared = resultcache.SharedTier(str(tmp_path), max_bytes=100, ttl=60)
+    shared.PRUNE_EVERY = 1
+    for key in 'abcdef':
+        shared.put(key, b'x' * 30)
+    remaining = [key for key in 'abcdef' if shared.get(key) is not None]
+    assert remaining and remaining == list('abcdef')[-len(remaining):] and len(remaining) <= 3
+
+
+def test_deterministic_routes_are_cached(client) -> None:
+    registry.cache.clear()
+    registry.cache.reset_stats()
+    for _ in range(3):
+        assert client.post('/api/url/encode', json={'data': 'a b'}).get_json()['output'] == 'a%20b'
+    client.post('/api/password', json={'length': 8, 'lowercase': True})
+    assert registry.cache.hits['memory'] == 2 and registry.cache.misses == 1
+    assert 'devterm_cache_hits_total{tier="memory"} 2' in client.get('/metrics').get_data(as_text=True)
+
+
+@pytest.fixture
+def limits():
+    from devterm_web.admission import admission
+    yield admission
+    admission.configure()
+
+
+def test_admission_rejects_large_bodies(client, limits) -> None:
+    limits.configure({'tools': {'case': {'max_body': 100}}})
+    response = client.post('/api/case', json={'data': 'x' * 200})
+    assert response.status_code == 413
+    assert response.get_json()['error'] == 'Request body is limited to 100 bytes for case'
+    assert client.post('/api/case', json={'data': 'x'}).status_code == 200
+    # Raw hash bodies are streamed, but JSON ones are buffered and limited.
+    limits.configure({'max_body': 100})
+    assert client.post('/api/hash', json={'data': 'x' * 200}).status_code == 413
+    assert client.post('/api/hash', data=b'x' * 200, content_type='application/octet-stream').status_code == 200
+
+
+def test_admission_rate_limits_per_client(client, limits) -> None:
+    limits.configure({'rate': 1, 'burst': 2, 'client_header': 'X-Forwarded-For'})
+    statuses = [client.post('/api/case', json={'data': 'x'}, headers={'X-Forwarded-For': '10.0.0.1'}).status_code
+                for _ in range(3)]
+    assert statuses == [200, 200, 429]
+    limited = client.post('/api/case', json={'data': 'x'}, headers={'X-Forwarded-For': '10.0.0.1'})
+    assert limited.headers['Retry-After'] == '1'
+    assert client.post('/api/case', json={'data': 'x'}, headers={'X-Forwarded-For': '10.0.0.2'}).status_code == 200
+    assert client.get('/metrics').status_code == 200
+
+
+def test_admission_gates_concurrency(client, limits) -> None:
+    limits.configure({'tools': {'case': {'concurrency': 1, 'queue': 1, 'queue_timeout': 0.05}}})
+    gate = limits.gate('case')
+    assert gate.acquire()
+    started = time.perf_counter()
+    response = client.post('/api/case', json={'data': 'x'})
+    assert response.status_code == 503 and response.headers['Retry-After'] == '1'
+    assert time.perf_counter() - started < 1
+    gate.release()
+    assert client.post('/api/case', json={'data': 'x'}).status_code == 200
+    assert gate.active == 0
+
+
+def test_password_json_output_is_bounded(client) -> None:
+    result = client.post('/api/password', json={'length': 10000, 'count': 10000, 'lowercase': True}).get_json()
+    assert result['success'] is False and 'stream' in result['error']
+
+
+def test_document_handles_serve_slices(client) -> None:
+    doc = {'users': [{'name': f'u{i}', 'tags': ['a'] * (i % 3)} for i in range(250)], 'meta': {'total': 250}}
+    created = client.post('/api/documents', data=json.dumps(doc), content_type='application/json').get_json()
+    handle = created['handle']
+    assert created['root'] == {'type': 'object', 'length': 2} and created['expires_in'] > 0
+
+    query = client.get(f'/api/documents/{handle}/query?path=$.users[*].name&offset=240&limit=5').get_json()
+    assert [m['value'] for m in query['matches']] == ['u240', 'u241', 'u242', 'u243', 'u244']
+    assert query['matches'][0]['path'] == '$.users[240].name' and query['next_offset'] == 245
+    deep = client.get(f'/api/documents/{handle}/query?path=$..total').get_json()
+    assert deep['matches'] == [{'path': '$.meta.total', 'value': 250}] and deep['next_offset'] is None
+
+    page = client.get(f'/api/documents/{handle}/extract?path=$.users&offset=100&limit=2&indent=1').get_json()
+    assert json.loads(page['output']) == doc['users'][100:102]
+    assert (page['type'], page['length'], page['next_offset']) == ('array', 250, 102)
+
+    keys = client.get(f'/api/documents/{handle}/keys?prefix=$.users').get_json()
+    index = {entry['path']: entry for entry in keys['keys']}
+    assert index['$.users[*].name']['count'] == 250
+    assert index['$.users[*].tags[*]']['types'] == {'string': sum(i % 3 for i in range(250))}
+
+    assert client.get(f'/api/documents/{handle}/extract?path=$.nope').status_code == 404
+    assert client.get(f'/api/documents/{handle}/query?path=users').status_code == 400
+    assert client.delete(f'/api/documents/{handle}').status_code == 200
+    assert client.get(f'/api/documents/{handle}').status_code == 404
+
+
+def test_document_store_budget_and_formats(client) -> None:
+    from devterm_web import documents
+    yaml_doc = client.post('/api/documents?format=yaml', data='a:\n  b: [1, 2]\n', content_type='text/plain').get_json()
+    extracted = client.get(f'/api/documents/{yaml_doc["handle"]}/extract?path=$.a.b[1]').get_json()
+    assert extracted['output'] == '2'
+    assert client.post('/api/documents', data='{"a": ', content_type='application/json').status_code == 400
+
+    store = documents.DocumentStore(max_bytes=100 * documents.MEMORY_FACTOR, ttl=60)
+    first = store.add(documents.Document({}, 'json', 60))
+    second = store.add(documents.Document({}, 'json', 30))
+    store.get(first)
+    third = store.add(documents.Document({}, 'json', 30))
+    assert (store.get(first) is not None, store.get(second), store.get(third) is not None) == (True, None, True)
+    expired = documents.DocumentStore(ttl=0)
+    assert expired.get(expired.add(documents.Document({}, 'json', 1))) is None
+
+
+def test_document_uploads_reserve_budget_and_offload_parsing(client, monkeypatch) -> None:
+    from devterm_web import documents
+    offloaded = []
+    monkeypatch.setattr(registry, 'offload', lambda fn, arg: offloaded.append(arg) or fn(arg))
+    handle = client.post('/api/documents', data='[[1, 2, 3]]', content_type='application/json').get_json()['handle']
+    assert len(offloaded) == 1
+    assert client.get(f'/api/documents/{handle}/extract?indent=17').status_code == 400
+
+    store = documents.DocumentStore(max_bytes=100 * documents.MEMORY_FACTOR, ttl=60)
+    stored = store.add(documents.Document({}, 'json', 50))
+    assert store.reserve(80 * documents.MEMORY_FACTOR) and store.get(stored) is None
+    assert not store.reserve(30 * documents.MEMORY_FACTOR)
+    store.release(80 * documents.MEMORY_FACTOR)
+    assert store.reserve(30 * documents.MEMORY_FACTOR)
+
+
+def test_document_uploads_and_queries_are_bounded(client, monkeypatch) -> None:
+    from devterm_web import documents
+    monkeypatch.setattr(documents, 'store', documents.DocumentStore(max_bytes=100 * documents.MEMORY_FACTOR, ttl=60))
+    body = json.dumps(['x' * 20] * 5)
+    assert client.post('/api/documents', data=body, content_type='application/json').status_code == 413
+    gzipped = client.post('/api/documents', data=gzip.compress(body.encode()),
+                          headers={'Content-Type': 'application/json', 'Content-Encoding': 'gzip'})
+    assert gzipped.status_code == 413 and len(documents.store) == 0
+
+    monkeypatch.setattr(documents, 'MAX_QUERY_BYTES', 64)
+    document = documents.Document({'big': list(range(100)), 'small': [1, 2]}, 'json', 300)
+    matches, _ = document.query('$.*')
+    assert matches[0] == {'path': '$.big', 'type': 'array', 'length': 100, 'truncated': True}
+    assert matches[1] == {'path': '$.small', 'value': [1, 2]}
+    assert documents.json_size(list(range(10 ** 6)), 1000) is None
+
+
+def test_api_responses_are_compressed_by_accept_encoding(client) -> None:
+    body = {'data': json.dumps([{'id': i, 'name': 'devterm'} for i in range(500)])}
+    plain = client.post('/api/json/format', json=body)
+    gzipped = client.post('/api/json/format', json=body, headers={'Accept-Encoding': 'gzip'})
+    assert plain.headers.get('Content-Encoding') is None and 'Accept-Encoding' in plain.headers['Vary']
+    assert gzipped.headers['Content-Encoding'] == 'gzip' and len(gzipped.data) < len(plain.data) // 5
+    assert gzip.decompress(gzipped.data) == plain.data
+
+    small = client.post('/api/case', json={'data': 'a b', 'type': 'upper'}, headers={'Accept-Encoding': 'gzip'})
+    assert small.headers.get('Content-Encoding') is None and small.get_json()['output'] == 'A B'
+    png = client.get('/api/qrcode?data=hello', headers={'Accept-Encoding': 'gzip'})
+    assert png.mimetype == 'image/png' and png.headers.get('Content-Encoding') is None
+    svg = client.get('/api/qrcode?data=hello&format=svg', headers={'Accept-Encoding': 'gzip'})
+    assert svg.headers['Content-Encoding'] == 'gzip' and svg.headers['ETag'].startswith('W/')
+    again = client.get('/api/qrcode?data=hello&format=svg', headers={'Accept-Encoding': 'gzip', 'If-None-Match': svg.headers['ETag']})
+    assert again.status_code == 304
+
+
+def test_compressed_request_bodies(client, limits) -> None:
+    headers = {'Content-Type': 'application/json', 'Content-Encoding': 'gzip'}
+    response = client.post('/api/case', data=gzip.compress(b'{"data": "a b", "type": "upper"}'), headers=headers)
+    assert response.get_json()['output'] == 'A B'
+    streamed = client.post('/api/hash?algorithms=sha256', data=gzip.compress(b'abc' * 1000),
+                           headers={'Content-Type': 'application/octet-stream', 'Content-Encoding': 'gzip'})
+    assert streamed.get_json()['digests']['sha256'] == hashlib.sha256(b'abc' * 1000).hexdigest()
+
+    assert client.post('/api/case', data=b'{}', headers={**headers, 'Content-Encoding': 'compress'}).status_code == 415
+    assert client.post('/api/case', data=b'not gzip', headers=headers).status_code == 400
+    limits.configure({'tools': {'case': {'max_body': 1000}}})
+    bomb = gzip.compress(b'{"data": "' + b'a' * 10000 + b'"}')
+    assert client.post('/api/case', data=bomb, headers=headers).status_code == 413
+
+
+def test_msgpack_requests_and_responses(client) -> None:
+    msgpack = pytest.importorskip('msgpack')
+    headers = {'Content-Type': 'application/msgpack', 'Accept': 'application/msgpack'}
+    response = client.post('/api/case', data=msgpack.packb({'data': 'a b', 'type': 'upper'}), headers=headers)
+    assert response.mimetype == 'application/msgpack' and 'Accept' in response.headers['Vary']
+    assert msgpack.unpackb(response.data)['output'] == 'A B'
+    assert client.post('/api/case', json={'data': 'x'}).mimetype == 'application/json'
+    assert client.post('/api/case', data=b'\xc1', headers=headers).status_code == 400